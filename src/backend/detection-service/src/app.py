@@ -1,28 +1,52 @@
 # External imports with versions
 from fastapi import FastAPI, Request  # version: 0.100.0
 from fastapi.middleware.cors import CORSMiddleware  # version: 0.100.0
-from fastapi.middleware.gzip import GZipMiddleware  # version: 0.100.0
+from brotli_asgi import BrotliMiddleware  # version: 1.4.0
 import uvicorn  # version: 0.23.0
+from anyio import to_thread  # version: 3.7.1
 from prometheus_fastapi_instrumentator import Instrumentator  # version: 6.1.0
 import sentry_sdk  # version: 1.29.0
 from sentry_sdk.integrations.asgi import SentryAsgiMiddleware
+from opentelemetry import trace  # version: 1.20.0
+from opentelemetry.sdk.trace import TracerProvider  # version: 1.20.0
+from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio  # version: 1.20.0
 import logging
+import logging.config
 from typing import Dict
 import time
 import os
+import uuid
+
+# Install uvloop policy before the app is created so ASGI workers pick it up
+try:
+    import uvloop  # version: 0.17.0
+    uvloop.install()
+except ImportError:
+    pass
 
 # Internal imports
 from .routes.detection import router as detection_router
-from .services.detection_service import DetectionService
+from .services.detection_service import DetectionService, TRACE_SAMPLING_RATE
 from .config import load_config
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured once by the app factory; modules only create loggers
+LOGGING_CONFIG = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'default': {'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'}
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'default'}
+    },
+    'root': {'level': 'INFO', 'handlers': ['console']}
+}
 logger = logging.getLogger(__name__)
 
+# Coarse latency buckets (seconds) around the 100ms detection target
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+THREADPOOL_SIZE = min(64, 4 * (os.cpu_count() or 1))
+
 def init_monitoring(app: FastAPI) -> None:
     """
     Initialize comprehensive monitoring and error tracking systems.
@@ -40,17 +64,27 @@ def init_monitoring(app: FastAPI) -> None:
     )
     app.add_middleware(SentryAsgiMiddleware)
     
+    # Sample traces at the root; unsampled requests get non-recording spans
+    trace.set_tracer_provider(
+        TracerProvider(sampler=ParentBasedTraceIdRatio(TRACE_SAMPLING_RATE))
+    )
+    
     # Initialize Prometheus metrics
     Instrumentator(
         should_group_status_codes=True,
         should_ignore_untemplated=True,
         should_respect_env_var=True,
         should_instrument_requests_inprogress=True,
-        excluded_handlers=["/health"],
+        excluded_handlers=["/health", "/metrics", "/api/docs", "/api/redoc", "/openapi.json"],
         env_var_name="ENABLE_METRICS",
         inprogress_name="wildlife_detection_inprogress",
-        inprogress_labels=True
-    ).instrument(app).expose(app, include_in_schema=False)
+        inprogress_labels=False
+    ).instrument(
+        app,
+        metric_namespace="wildlife",
+        metric_subsystem="detection",
+        latency_lowr_buckets=METRICS_LATENCY_BUCKETS
+    ).expose(app, include_in_schema=False)
     
     logger.info("Monitoring systems initialized successfully")
 
@@ -62,6 +96,8 @@ def create_app() -> FastAPI:
     Returns:
         FastAPI: Configured FastAPI application instance
     """
+    logging.config.dictConfig(LOGGING_CONFIG)
+    
     # Create FastAPI instance with OpenAPI documentation
     app = FastAPI(
         title="Wildlife Detection Service",
@@ -90,28 +126,28 @@ def create_app() -> FastAPI:
         allow_headers=["*"]
     )
     
-    # Add compression middleware
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    # Add compression middleware (Brotli when accepted, gzip otherwise);
+    # small bodies and health probes are sent uncompressed
+    app.add_middleware(
+        BrotliMiddleware,
+        quality=4,
+        minimum_size=4096,
+        gzip_fallback=True,
+        excluded_handlers=["/health"]
+    )
     
     # Initialize monitoring
     init_monitoring(app)
     
-    # Add request ID middleware
+    # Add request ID and performance monitoring middleware
     @app.middleware("http")
-    async def add_request_id(request: Request, call_next):
-        request_id = request.headers.get('X-Request-ID', str(time.time()))
+    async def add_request_context(request: Request, call_next):
+        start_ns = time.monotonic_ns()
+        request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
         request.state.request_id = request_id
         response = await call_next(request)
         response.headers['X-Request-ID'] = request_id
-        return response
-    
-    # Add performance monitoring middleware
-    @app.middleware("http")
-    async def add_performance_metrics(request: Request, call_next):
-        start_time = time.perf_counter()
-        response = await call_next(request)
-        process_time = (time.perf_counter() - start_time) * 1000
-        response.headers['X-Process-Time'] = str(process_time)
+        response.headers['X-Process-Time'] = f"{(time.monotonic_ns() - start_ns) / 1e6:.3f}"
         return response
     
     # Register routes
@@ -145,7 +181,9 @@ def create_app() -> FastAPI:
     async def startup_event():
         """Initialize services on startup"""
         logger.info("Starting Wildlife Detection Service")
-        # Additional startup initialization can be added here
+        
+        # Size the worker thread pool used for sync handlers and run_in_threadpool
+        to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     
     # Shutdown event handler
     @app.on_event("shutdown")
@@ -158,11 +196,9 @@ def create_app() -> FastAPI:
 
 def main():
     """Application entry point with server configuration"""
-    app = create_app()
-    
-    # Configure uvicorn server
+    # Pass the import string so each worker builds the app exactly once
     uvicorn.run(
-        app,
+        "src.app:app",
         host="0.0.0.0",
         port=8080,
         workers=4,
@@ -2,43 +2,89 @@
 import os  # version: system
 import yaml  # version: 6.0.1
 from dataclasses import dataclass, field  # version: system
-from typing import Dict, Tuple, Optional, Any  # version: system
+from typing import Dict, Tuple, Optional, Any, Mapping  # version: system
+from types import MappingProxyType  # version: system
 import logging  # version: system
-from functools import wraps  # version: system
+from functools import lru_cache  # version: system
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 # Global constants
 DEFAULT_CONFIG_PATH = '/etc/detection-service/config.yml'
 ENVIRONMENT_VARIABLE_PREFIX = 'DETECTION_SERVICE_'
 CONFIG_VERSION = '1.0.0'
 ALLOWED_ENVIRONMENTS = ['development', 'staging', 'production']
+ALLOWED_COMPUTE_DTYPES = ['fp32', 'fp16', 'bf16', 'int8']
+DEFAULT_COMPUTE_DTYPE = 'fp16'
 DEFAULT_ENVIRONMENT = 'development'
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Shared read-only defaults for frozen configuration dataclasses
+# (dataclasses reject unhashable defaults, so factories return the shared proxy)
+_MODEL_QUANTIZATION_DEFAULT = MappingProxyType({
+    'type': 'INT8',
+    'calibration_steps': 100,
+    'optimization_level': 3
+})
+_PERFORMANCE_METRICS_DEFAULT = MappingProxyType({
+    'accuracy_threshold': 0.90,
+    'latency_threshold_ms': 100,
+    'memory_limit_mb': 512
+})
+_RATE_LIMITS_DEFAULT = MappingProxyType({
+    'default': {'requests': 60, 'period': 60},
+    '/detect': {'requests': 30, 'period': 60}
+})
+_SECURITY_SETTINGS_DEFAULT = MappingProxyType({
+    'tls_enabled': True,
+    'min_tls_version': 'TLSv1.2',
+    'cipher_suites': ['TLS_AES_256_GCM_SHA384', 'TLS_CHACHA20_POLY1305_SHA256'],
+    'client_cert_required': True
+})
+_MONITORING_CONFIG_DEFAULT = MappingProxyType({
+    'metrics_enabled': True,
+    'tracing_enabled': True,
+    'logging_level': 'INFO',
+    'performance_monitoring': True
+})
+_HEALTH_CHECK_CONFIG_DEFAULT = MappingProxyType({
+    'enabled': True,
+    'interval_seconds': 30,
+    'timeout_seconds': 5,
+    'unhealthy_threshold': 3
+})
+_CIRCUIT_BREAKER_CONFIG_DEFAULT = MappingProxyType({
+    'failure_threshold': 5,
+    'recovery_timeout': 30,
+    'half_open_timeout': 5
+})
+
+# Module logger; handlers are configured by the app factory
 logger = logging.getLogger(__name__)
 
 def validate_config(cls):
     """Decorator to validate configuration dataclasses"""
-    def validate_instance(instance):
-        for field_name, field_value in instance.__dict__.items():
-            validator_name = f'validate_{field_name}'
-            if hasattr(instance, validator_name):
-                validator = getattr(instance, validator_name)
-                if not validator(field_value):
-                    raise ValueError(f"Invalid configuration for {field_name}: {field_value}")
-        return True
-
-    def wrap(init):
-        @wraps(init)
-        def validated_init(self, *args, **kwargs):
-            init(self, *args, **kwargs)
-            validate_instance(self)
-        return validated_init
-
-    setattr(cls, '__post_init__', wrap(cls.__post_init__ if hasattr(cls, '__post_init__') else lambda self: None))
+    # Resolve field validators once per class instead of per instance
+    validators = {
+        name[len('validate_'):]: fn
+        for name, fn in vars(cls).items()
+        if name.startswith('validate_') and callable(fn)
+    }
+    post_init = getattr(cls, '__post_init__', None)
+
+    def validated_post_init(self):
+        if post_init is not None:
+            post_init(self)
+        for field_name, validator in validators.items():
+            field_value = getattr(self, field_name)
+            if not validator(self, field_value):
+                raise ValueError(f"Invalid configuration for {field_name}: {field_value}")
+
+    cls._validators = validators
+    cls.__post_init__ = validated_post_init
     return cls
 
 @dataclass(frozen=True)
@@ -53,16 +99,9 @@ class MLConfig:
     batch_size: int = field(default=32)
     learning_rate: float = field(default=0.001)
     processing_timeout_ms: int = field(default=100)
-    model_quantization: Dict[str, Any] = field(default_factory=lambda: {
-        'type': 'INT8',
-        'calibration_steps': 100,
-        'optimization_level': 3
-    })
-    performance_metrics: Dict[str, Any] = field(default_factory=lambda: {
-        'accuracy_threshold': 0.90,
-        'latency_threshold_ms': 100,
-        'memory_limit_mb': 512
-    })
+    compute_dtype: str = field(default=DEFAULT_COMPUTE_DTYPE)
+    model_quantization: Mapping[str, Any] = field(default_factory=lambda: _MODEL_QUANTIZATION_DEFAULT)
+    performance_metrics: Mapping[str, Any] = field(default_factory=lambda: _PERFORMANCE_METRICS_DEFAULT)
 
     def validate_model_path(self, value: str) -> bool:
         """Validate model path exists and is accessible"""
@@ -87,6 +126,10 @@ class MLConfig:
         """Validate time constants range"""
         return 1 <= value[0] < value[1] <= 1000
 
+    def validate_compute_dtype(self, value: str) -> bool:
+        """Validate inference compute precision"""
+        return value in ALLOWED_COMPUTE_DTYPES
+
 @dataclass(frozen=True)
 @validate_config
 class APIConfig:
@@ -96,33 +139,11 @@ class APIConfig:
     api_version: str = field(default='v1')
     timeout: int = field(default=5000)
     max_retries: int = field(default=3)
-    rate_limits: Dict[str, Any] = field(default_factory=lambda: {
-        'default': {'requests': 60, 'period': 60},
-        '/detect': {'requests': 30, 'period': 60}
-    })
-    security_settings: Dict[str, Any] = field(default_factory=lambda: {
-        'tls_enabled': True,
-        'min_tls_version': 'TLSv1.2',
-        'cipher_suites': ['TLS_AES_256_GCM_SHA384', 'TLS_CHACHA20_POLY1305_SHA256'],
-        'client_cert_required': True
-    })
-    monitoring_config: Dict[str, Any] = field(default_factory=lambda: {
-        'metrics_enabled': True,
-        'tracing_enabled': True,
-        'logging_level': 'INFO',
-        'performance_monitoring': True
-    })
-    health_check_config: Dict[str, Any] = field(default_factory=lambda: {
-        'enabled': True,
-        'interval_seconds': 30,
-        'timeout_seconds': 5,
-        'unhealthy_threshold': 3
-    })
-    circuit_breaker_config: Dict[str, Any] = field(default_factory=lambda: {
-        'failure_threshold': 5,
-        'recovery_timeout': 30,
-        'half_open_timeout': 5
-    })
+    rate_limits: Mapping[str, Any] = field(default_factory=lambda: _RATE_LIMITS_DEFAULT)
+    security_settings: Mapping[str, Any] = field(default_factory=lambda: _SECURITY_SETTINGS_DEFAULT)
+    monitoring_config: Mapping[str, Any] = field(default_factory=lambda: _MONITORING_CONFIG_DEFAULT)
+    health_check_config: Mapping[str, Any] = field(default_factory=lambda: _HEALTH_CHECK_CONFIG_DEFAULT)
+    circuit_breaker_config: Mapping[str, Any] = field(default_factory=lambda: _CIRCUIT_BREAKER_CONFIG_DEFAULT)
 
     def validate_port(self, value: int) -> bool:
         """Validate port number"""
@@ -140,27 +161,48 @@ def get_environment() -> str:
         return DEFAULT_ENVIRONMENT
     return env
 
+@lru_cache(maxsize=8)
+def _parse_config_file(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse YAML configuration, cached per file modification time"""
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+@lru_cache(maxsize=8)
+def _build_configs(
+    config_path: str,
+    mtime_ns: Optional[int],
+    env_overrides: Tuple[Tuple[str, str], ...]
+) -> Tuple[MLConfig, APIConfig]:
+    """Build validated configurations, cached per config file version and environment"""
+    config_data = dict(_parse_config_file(config_path, mtime_ns)) if mtime_ns is not None else {}
+
+    # Override with environment variables
+    config_data.update(env_overrides)
+
+    # Create and validate configurations
+    ml_config = MLConfig(**config_data.get('ml_config', {}))
+    api_config = APIConfig(**config_data.get('api_config', {}))
+    return ml_config, api_config
+
 def load_config(config_path: str = DEFAULT_CONFIG_PATH, validate_strict: bool = True) -> Tuple[MLConfig, APIConfig]:
     """Load and validate configuration from YAML and environment"""
     try:
-        # Load YAML configuration
+        # Locate YAML configuration
         if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                config_data = yaml.safe_load(f)
+            mtime_ns = os.stat(config_path).st_mtime_ns
         else:
             logger.warning(f"Config file not found at {config_path}, using defaults")
-            config_data = {}
+            mtime_ns = None
 
-        # Override with environment variables
+        # Collect environment variable overrides
         env_prefix = ENVIRONMENT_VARIABLE_PREFIX
-        for key, value in os.environ.items():
-            if key.startswith(env_prefix):
-                config_key = key[len(env_prefix):].lower()
-                config_data[config_key] = value
-
-        # Create and validate configurations
-        ml_config = MLConfig(**config_data.get('ml_config', {}))
-        api_config = APIConfig(**config_data.get('api_config', {}))
+        env_overrides = tuple(sorted(
+            (key[len(env_prefix):].lower(), value)
+            for key, value in os.environ.items()
+            if key.startswith(env_prefix)
+        ))
+
+        ml_config, api_config = _build_configs(config_path, mtime_ns, env_overrides)
 
         # Log configuration state
         logger.info(f"Configuration loaded successfully for environment: {get_environment()}")
@@ -3,19 +3,23 @@ import numpy as np  # version: 1.24.0
 import tensorflow as tf  # version: 2.14.0
 import torch  # version: 2.1.0
 import open3d as o3d  # version: 0.17.0
+from scipy.spatial import cKDTree  # version: 1.11.2
+import DracoPy  # version: 1.3.0
+import xxhash  # version: 3.4.1
+from cachetools import TTLCache  # version: 5.3.1
 import logging
-from typing import Dict, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import time
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from collections import deque
 
 # Internal imports
 from .lnn_model import LiquidNeuralNetwork, preprocess_input
 from ..utils.image_processing import preprocess_image
 from ..utils.model_utils import load_model
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Module logger; handlers are configured by the app factory
 logger = logging.getLogger(__name__)
 
 # Global constants
@@ -25,6 +29,38 @@ DEFAULT_GPU_MEMORY_LIMIT = 1024  # MB
 DEFAULT_CACHE_TTL = 300  # seconds
 PROCESSING_TIMEOUT = 100  # ms
 MAX_BATCH_SIZE = 32
+RESULT_CACHE_SIZE = 2048
+METRICS_HISTORY_SIZE = 1024
+NORMAL_ESTIMATION_NEIGHBORS = 30
+MIN_SCAN_POINTS = 2  # neighbour analyses need each point plus at least one other
+NORMAL_SEARCH_RADIUS = 0.1
+INFERENCE_DTYPE = torch.bfloat16
+MESH_QUANTIZATION_BITS = 14
+DENSITY_QUANTILE_LABELS = ('min', 'p50', 'p90', 'p99', 'max')
+
+@dataclass(frozen=True)
+class PointCloud:
+    """3D scan points stored structure-of-arrays: one contiguous array per axis"""
+    x: np.ndarray
+    y: np.ndarray
+    z: np.ndarray
+
+    @classmethod
+    def from_array(cls, points: np.ndarray) -> 'PointCloud':
+        """Split interleaved (N, 3) or flat xyz points into per-axis arrays"""
+        points = np.asarray(points).reshape(-1, 3)
+        return cls(*(np.ascontiguousarray(points[:, axis]) for axis in range(3)))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def to_array(self, dtype=np.float32) -> np.ndarray:
+        """Interleave the axes into an (N, 3) array of dtype for libraries that need xyz rows"""
+        points = np.empty((len(self), 3), dtype=dtype)
+        points[:, 0] = self.x
+        points[:, 1] = self.y
+        points[:, 2] = self.z
+        return points
 
 @dataclass
 class ProcessingMetrics:
@@ -52,7 +88,7 @@ class FossilDetector:
         try:
             # Initialize logging and monitoring
             self.logger = logging.getLogger(__name__)
-            self.metrics = {}
+            self.metrics = deque(maxlen=METRICS_HISTORY_SIZE)
             
             # Load and validate configuration
             self.config = self._validate_config(config)
@@ -63,15 +99,15 @@ class FossilDetector:
             # Configure GPU and memory management
             self._setup_gpu_environment()
             
+            # Per-thread scratch: Open3D point cloud, pinned staging buffer and its event
+            self._scratch = threading.local()
+            
             # Initialize LNN model
             self.lnn_model = self._initialize_model(model_path)
             
             # Setup result caching
-            self.result_cache = {}
             self.cache_ttl = DEFAULT_CACHE_TTL
-            
-            # Initialize thread pool for parallel processing
-            self.thread_pool = ThreadPoolExecutor(max_workers=4)
+            self.result_cache = TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=self.cache_ttl)
             
             logger.info("Fossil detector initialized successfully")
             
@@ -92,13 +128,14 @@ class FossilDetector:
         if torch.cuda.is_available():
             self.device = torch.device('cuda')
             torch.cuda.set_device(0)
-            torch.cuda.empty_cache()
-            torch.backends.cudnn.benchmark = True
             
-            # Set memory limits
+            # Set memory limits before the caching allocator reserves any blocks
             torch.cuda.set_per_process_memory_fraction(
                 self.config.get('gpu_memory_fraction', 0.8)
             )
+            torch.cuda.empty_cache()
+            torch.backends.cudnn.benchmark = True
+            torch.set_float32_matmul_precision('high')
         else:
             self.device = torch.device('cpu')
             logger.warning("GPU not available, using CPU")
@@ -118,7 +155,66 @@ class FossilDetector:
             logger.error(f"Model initialization error: {str(e)}")
             raise
 
-    def process_3d_scan(self, point_cloud: np.ndarray) -> Tuple[np.ndarray, Dict]:
+    def _stage_input(self, points: np.ndarray) -> torch.Tensor:
+        """Copy points to the device through this thread's reusable pinned staging buffer"""
+        if self.device.type != 'cuda':
+            return torch.from_numpy(points).float()
+        
+        # detect_fossil and batch_detect run on worker threads concurrently, so each
+        # thread stages through its own buffer
+        scratch = self._scratch
+        num_points = len(points)
+        pinned_input = getattr(scratch, 'pinned_input', None)
+        if pinned_input is None or num_points > pinned_input.shape[0]:
+            pinned_input = scratch.pinned_input = torch.empty(
+                (max(num_points, self.point_cloud_resolution), 3),
+                dtype=torch.float32,
+                pin_memory=True
+            )
+        if getattr(scratch, 'staging_event', None) is None:
+            scratch.staging_event = torch.cuda.Event()
+        
+        # Previous transfer must finish reading the buffer before it is reused
+        scratch.staging_event.synchronize()
+        staging = pinned_input[:num_points]
+        np.copyto(staging.numpy(), points, casting='same_kind')
+        input_tensor = staging.to(self.device, non_blocking=True)
+        scratch.staging_event.record()
+        return input_tensor
+
+    def _load_scratch_point_cloud(self, points: Union[np.ndarray, PointCloud]) -> o3d.geometry.PointCloud:
+        """Load points into this thread's reusable Open3D point cloud"""
+        pcd = getattr(self._scratch, 'pcd', None)
+        if pcd is None:
+            pcd = self._scratch.pcd = o3d.geometry.PointCloud()
+        
+        # Open3D stores float64; convert once here instead of inside the binding.
+        # Per-axis input is interleaved by that same single conversion copy.
+        if isinstance(points, PointCloud):
+            points = points.to_array(np.float64)
+        pcd.points = o3d.utility.Vector3dVector(
+            np.ascontiguousarray(points, dtype=np.float64)
+        )
+        return pcd
+
+    def validate_scan_data(self, scan_data: Union[np.ndarray, PointCloud]) -> bool:
+        """Check that scan data holds at least MIN_SCAN_POINTS finite xyz points"""
+        if isinstance(scan_data, PointCloud):
+            axes = (scan_data.x, scan_data.y, scan_data.z)
+            return (
+                len(scan_data) >= MIN_SCAN_POINTS
+                and all(a.ndim == 1 and len(a) == len(scan_data) for a in axes)
+                and all(np.isfinite(a).all() for a in axes)
+            )
+        if (
+            not isinstance(scan_data, np.ndarray)
+            or scan_data.size < 3 * MIN_SCAN_POINTS
+            or scan_data.size % 3
+        ):
+            return False
+        return bool(np.isfinite(scan_data).all())
+
+    def process_3d_scan(self, point_cloud: Union[np.ndarray, PointCloud]) -> Tuple[np.ndarray, Dict]:
         """
         Process and validate 3D scan data with parallel processing optimization.
         
@@ -132,41 +228,40 @@ class FossilDetector:
             start_time = time.perf_counter()
             
             # Validate input data
-            if not isinstance(point_cloud, np.ndarray):
+            if not isinstance(point_cloud, (np.ndarray, PointCloud)):
                 raise ValueError("Invalid point cloud format")
             
             # Convert to Open3D format
-            pcd = o3d.geometry.PointCloud()
-            pcd.points = o3d.utility.Vector3dVector(point_cloud)
+            pcd = self._load_scratch_point_cloud(point_cloud)
             
             # Downsample for efficiency
             pcd = pcd.voxel_down_sample(
                 voxel_size=self.config.get('voxel_size', 0.05)
             )
             
-            # Extract features in parallel
-            with ThreadPoolExecutor() as executor:
-                futures = [
-                    executor.submit(self._extract_geometric_features, pcd),
-                    executor.submit(self._compute_surface_normals, pcd),
-                    executor.submit(self._analyze_density_distribution, pcd)
-                ]
-                
-                features = {
-                    'geometric': futures[0].result(),
-                    'normals': futures[1].result(),
-                    'density': futures[2].result()
-                }
+            # Downsampling can merge a sparse scan into a single voxel
+            if len(pcd.points) < MIN_SCAN_POINTS:
+                raise ValueError(
+                    f"Point cloud needs at least {MIN_SCAN_POINTS} points after downsampling"
+                )
+            
+            # Build one spatial index and share its neighbourhoods between analyses
+            neighbors = self._query_neighbors(np.asarray(pcd.points))
+            features = {
+                'geometric': self._extract_geometric_features(pcd),
+                'normals': self._compute_surface_normals(pcd, neighbors=neighbors),
+                'density': self._analyze_density_distribution(pcd, neighbors=neighbors)
+            }
             
             # Track processing metrics
             processing_time = time.perf_counter() - start_time
-            self.metrics[time.time()] = ProcessingMetrics(
+            self.metrics.append(ProcessingMetrics(
                 processing_time=processing_time,
                 memory_usage=torch.cuda.max_memory_allocated() if torch.cuda.is_available() else 0,
                 confidence_score=0.0,  # Updated during detection
                 point_cloud_density=len(pcd.points),
                 timestamp=time.time()
-            )
+            ))
             
             return np.asarray(pcd.points), features
             
@@ -174,44 +269,32 @@ class FossilDetector:
             logger.error(f"3D scan processing error: {str(e)}")
             raise
 
-    def detect_fossil(self, scan_data: np.ndarray) -> Dict:
+    def detect_fossil(self, scan_data: Union[np.ndarray, PointCloud]) -> Dict:
         """
         Perform high-accuracy fossil detection with confidence scoring.
         
         Args:
-            scan_data: Processed 3D scan data
+            scan_data: Processed 3D scan data, interleaved or per-axis
             
         Returns:
             Detection results including fossil type, confidence, and measurements
         """
         try:
             # Check cache for previous results
-            cache_key = hash(scan_data.tobytes())
-            if cache_key in self.result_cache:
-                cache_entry = self.result_cache[cache_key]
-                if time.time() - cache_entry['timestamp'] < self.cache_ttl:
-                    return cache_entry['result']
+            cache_key = self._result_cache_key(scan_data)
+            cached_result = self.result_cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result
             
             # Process scan data
             processed_data, features = self.process_3d_scan(scan_data)
             
             # Prepare input tensor
-            input_tensor = torch.from_numpy(processed_data).float().to(self.device)
+            input_tensor = self._stage_input(processed_data)
             if len(input_tensor.shape) == 2:
                 input_tensor = input_tensor.unsqueeze(0)
             
-            # Run inference with error handling
-            with torch.no_grad():
-                try:
-                    predictions = self.lnn_model.predict(input_tensor)
-                except RuntimeError as e:
-                    logger.error(f"Inference error: {str(e)}")
-                    self._handle_inference_error()
-                    predictions = self.lnn_model.predict(input_tensor)
-            
-            # Process results
-            confidence_scores = torch.nn.functional.softmax(predictions, dim=1)
-            max_confidence, fossil_type = torch.max(confidence_scores, dim=1)
+            fossil_type, max_confidence = self._run_inference(input_tensor)
             
             # Generate detailed measurements
             measurements = self._generate_measurements(processed_data, features)
@@ -222,14 +305,11 @@ class FossilDetector:
                 'confidence': max_confidence.item(),
                 'measurements': measurements,
                 'features': features,
-                'processing_time': time.time() - self.metrics[time.time()].timestamp
+                'processing_time': time.time() - self.metrics[-1].timestamp
             }
             
             # Cache results
-            self.result_cache[cache_key] = {
-                'result': result,
-                'timestamp': time.time()
-            }
+            self.result_cache[cache_key] = result
             
             return result
             
@@ -237,6 +317,100 @@ class FossilDetector:
             logger.error(f"Fossil detection error: {str(e)}")
             raise
 
+    def batch_detect(self, scans: List[np.ndarray]) -> List[Dict]:
+        """
+        Detect fossils in several scans with a single batched forward pass.
+        
+        Args:
+            scans: List of processed 3D scan arrays
+            
+        Returns:
+            Detection results in input order
+        """
+        try:
+            results = [None] * len(scans)
+            pending = []
+            
+            # Serve cached scans and run per-scan geometry for the rest
+            for idx, scan_data in enumerate(scans):
+                cache_key = self._result_cache_key(scan_data)
+                cached_result = self.result_cache.get(cache_key)
+                if cached_result is not None:
+                    results[idx] = cached_result
+                    continue
+                processed_data, features = self.process_3d_scan(scan_data)
+                pending.append((idx, cache_key, processed_data, features, self.metrics[-1].timestamp))
+            
+            if not pending:
+                return results
+            
+            # Stack scans of equal point count into one forward pass each; padding
+            # would feed fake points to the model and disagree with detect_fossil
+            groups = {}
+            for item in pending:
+                groups.setdefault(len(item[2]), []).append(item)
+            
+            for num_points, group in groups.items():
+                batch = np.stack([processed_data for _, _, processed_data, _, _ in group])
+                input_tensor = self._stage_input(batch.reshape(-1, 3)).view(len(group), num_points, 3)
+                
+                fossil_types, confidences = self._run_inference(input_tensor)
+                fossil_types, confidences = fossil_types.tolist(), confidences.tolist()
+                
+                for row, (idx, cache_key, processed_data, features, timestamp) in enumerate(group):
+                    result = {
+                        'fossil_type': fossil_types[row],
+                        'confidence': confidences[row],
+                        'measurements': self._generate_measurements(processed_data, features),
+                        'features': features,
+                        'processing_time': time.time() - timestamp
+                    }
+                    self.result_cache[cache_key] = result
+                    results[idx] = result
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch fossil detection error: {str(e)}")
+            raise
+
+    @staticmethod
+    def _result_cache_key(scan_data: Union[np.ndarray, PointCloud]) -> int:
+        """Content hash of a scan for the result cache"""
+        if isinstance(scan_data, PointCloud):
+            hasher = xxhash.xxh3_64()
+            for axis in (scan_data.x, scan_data.y, scan_data.z):
+                hasher.update(np.ascontiguousarray(axis).view(np.uint8))
+            return hasher.intdigest()
+        return xxhash.xxh3_64_intdigest(np.ascontiguousarray(scan_data).view(np.uint8))
+
+    def _run_inference(self, input_tensor: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Run the LNN and return per-sample fossil type and top-class confidence"""
+        with torch.inference_mode():
+            with torch.autocast(
+                device_type=self.device.type,
+                dtype=INFERENCE_DTYPE,
+                enabled=self.device.type == 'cuda'
+            ):
+                try:
+                    predictions = self.lnn_model.predict(input_tensor)
+                except torch.cuda.OutOfMemoryError as e:
+                    logger.error(f"Inference out of memory: {str(e)}")
+                    self._handle_inference_error()
+                    # Retry in halves to lower peak activation memory
+                    chunk_size = max(1, len(input_tensor) // 2)
+                    predictions = torch.cat([
+                        self.lnn_model.predict(chunk)
+                        for chunk in input_tensor.split(chunk_size)
+                    ])
+            predictions = predictions.float()
+            
+            # Top-class softmax probability without materializing all classes
+            fossil_type = predictions.argmax(dim=1)
+            max_logit = predictions.gather(1, fossil_type.unsqueeze(1)).squeeze(1)
+            max_confidence = torch.exp(max_logit - torch.logsumexp(predictions, dim=1))
+        return fossil_type, max_confidence
+
     def estimate_fossil_age(self, fossil_features: np.ndarray) -> Dict:
         """
         Estimate geological age with confidence intervals.
@@ -278,7 +452,22 @@ class FossilDetector:
             logger.error(f"Age estimation error: {str(e)}")
             raise
 
-    def generate_3d_model(self, scan_data: np.ndarray) -> bytes:
+    def estimate_fossil_ages(self, features_list: List[Dict]) -> List[Dict]:
+        """
+        Estimate geological ages for several detections, one at a time.
+        
+        Each detection goes through estimate_fossil_age; the single call lets
+        async callers move the whole batch to one worker thread.
+        
+        Args:
+            features_list: Extracted features for each detection
+            
+        Returns:
+            Age estimations in input order
+        """
+        return [self.estimate_fossil_age(features) for features in features_list]
+
+    def generate_3d_model(self, scan_data: Union[np.ndarray, PointCloud]) -> bytes:
         """
         Generate optimized 3D model with progressive mesh generation.
         
@@ -286,16 +475,15 @@ class FossilDetector:
             scan_data: Processed scan data
             
         Returns:
-            Optimized 3D model data in standard format
+            Draco-encoded 3D model data
         """
         try:
             # Validate scan data
-            if not self._validate_scan_data(scan_data):
+            if not self.validate_scan_data(scan_data):
                 raise ValueError("Invalid scan data")
             
             # Create mesh from point cloud
-            pcd = o3d.geometry.PointCloud()
-            pcd.points = o3d.utility.Vector3dVector(scan_data)
+            pcd = self._load_scratch_point_cloud(scan_data)
             
             # Generate mesh
             mesh = o3d.geometry.TriangleMesh.create_from_point_cloud_poisson(
@@ -312,19 +500,12 @@ class FossilDetector:
             # Generate texture maps
             textures = self._generate_textures(mesh)
             
-            # Export model
-            with o3d.io.BytesIO() as buffer:
-                o3d.io.write_triangle_mesh(
-                    buffer,
-                    mesh,
-                    write_ascii=False,
-                    compressed=True,
-                    write_vertex_normals=True,
-                    write_vertex_colors=True,
-                    write_triangle_uvs=True,
-                    print_progress=False
-                )
-                model_data = buffer.getvalue()
+            # Export model as a Draco-compressed mesh
+            model_data = DracoPy.encode(
+                np.asarray(mesh.vertices),
+                np.asarray(mesh.triangles),
+                quantization_bits=MESH_QUANTIZATION_BITS
+            )
             
             return model_data
             
@@ -334,46 +515,79 @@ class FossilDetector:
 
     # Helper methods for feature extraction and processing
     def _extract_geometric_features(self, pcd: o3d.geometry.PointCloud) -> Dict:
-        """Extract geometric features from point cloud"""
-        features = {}
-        features['bbox'] = pcd.get_axis_aligned_bounding_box()
-        features['surface_area'] = pcd.get_surface_area()
-        features['volume'] = pcd.get_volume()
-        return features
+        """Extract axis-aligned bounding box features from point cloud"""
+        points = np.asarray(pcd.points)
+        bbox_min = points.min(axis=0)
+        bbox_max = points.max(axis=0)
+        extent = bbox_max - bbox_min
+        return {
+            'bbox_min': bbox_min,
+            'bbox_max': bbox_max,
+            'extent': extent,
+            'bbox_volume': float(extent.prod())
+        }
 
-    def _compute_surface_normals(self, pcd: o3d.geometry.PointCloud) -> np.ndarray:
-        """Compute surface normals with optimization"""
-        pcd.estimate_normals(
-            search_param=o3d.geometry.KDTreeSearchParamHybrid(
-                radius=0.1, max_nn=30
-            )
-        )
-        return np.asarray(pcd.normals)
+    def _query_neighbors(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Query nearest neighbours for every point with a single KDTree build"""
+        k = min(NORMAL_ESTIMATION_NEIGHBORS, len(points))
+        return cKDTree(points).query(points, k=k, workers=-1)
+
+    def _compute_surface_normals(
+        self,
+        pcd: o3d.geometry.PointCloud,
+        neighbors: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> np.ndarray:
+        """Compute surface normals from local neighbourhood covariance"""
+        points = np.asarray(pcd.points)
+        distances, indices = neighbors if neighbors is not None else self._query_neighbors(points)
+        
+        # Hybrid search: keep up to k neighbours within the search radius
+        weights = (distances <= NORMAL_SEARCH_RADIUS)[..., np.newaxis].astype(np.float64)
+        counts = weights.sum(axis=1)
+        neighborhoods = points[indices]
+        centroids = (neighborhoods * weights).sum(axis=1) / counts
+        centered = (neighborhoods - centroids[:, np.newaxis, :]) * weights
+        covariance = np.einsum('nki,nkj->nij', centered, centered) / counts[..., np.newaxis]
+        
+        # Normal is the eigenvector of the smallest eigenvalue
+        _, eigenvectors = np.linalg.eigh(covariance)
+        normals = eigenvectors[:, :, 0]
+        pcd.normals = o3d.utility.Vector3dVector(normals)
+        return normals
 
-    def _analyze_density_distribution(self, pcd: o3d.geometry.PointCloud) -> Dict:
+    def _analyze_density_distribution(
+        self,
+        pcd: o3d.geometry.PointCloud,
+        neighbors: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> Dict:
         """Analyze point cloud density distribution"""
-        densities = np.asarray(pcd.compute_nearest_neighbor_distance())
+        points = np.asarray(pcd.points)
+        distances, _ = neighbors if neighbors is not None else self._query_neighbors(points)
+        densities = distances[:, 1]
+        
+        # Selection-based quantiles avoid a full sort of the distances
+        last = len(densities) - 1
+        kth = [0, last // 2, int(0.9 * last), int(0.99 * last), last]
+        quantiles = np.partition(densities, kth)[kth]
         return {
-            'mean_density': np.mean(densities),
-            'std_density': np.std(densities),
-            'density_histogram': np.histogram(densities, bins=50)
+            'mean_density': float(np.mean(densities)),
+            'std_density': float(np.std(densities)),
+            'density_quantiles': dict(zip(DENSITY_QUANTILE_LABELS, quantiles.tolist()))
         }
 
     def _handle_inference_error(self):
-        """Handle inference errors with recovery strategies"""
-        torch.cuda.empty_cache()
-        self.lnn_model = self.lnn_model.cpu()
-        self.lnn_model = self.lnn_model.to(self.device)
+        """Release cached allocator blocks so an out-of-memory inference can be retried"""
+        if self.device.type == 'cuda':
+            torch.cuda.empty_cache()
 
     def _generate_measurements(self, point_cloud: np.ndarray, features: Dict) -> Dict:
         """Generate detailed measurements from point cloud data"""
-        bbox = features['geometric']['bbox']
+        extent = features['geometric']['extent']
         return {
-            'length': bbox.get_max_bound()[0] - bbox.get_min_bound()[0],
-            'width': bbox.get_max_bound()[1] - bbox.get_min_bound()[1],
-            'height': bbox.get_max_bound()[2] - bbox.get_min_bound()[2],
-            'surface_area': features['geometric']['surface_area'],
-            'volume': features['geometric']['volume']
+            'length': float(extent[0]),
+            'width': float(extent[1]),
+            'height': float(extent[2]),
+            'volume': features['geometric']['bbox_volume']
         }
 
     def _optimize_mesh(self, mesh: o3d.geometry.TriangleMesh) -> o3d.geometry.TriangleMesh:
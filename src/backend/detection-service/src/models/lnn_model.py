@@ -1,17 +1,17 @@
 # External imports with versions
 import numpy as np  # version: 1.24.0
-import tensorflow as tf  # version: 2.14.0
+import math
 import torch  # version: 2.1.0
-from PIL import Image  # version: 10.0.0
+import cv2  # version: 4.8.0
 import logging
+import threading
+from collections import OrderedDict
 from typing import Dict, Optional, Tuple, Union
-from dataclasses import dataclass
 
 # Internal imports
 from ..config import MLConfig
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Module logger; handlers are configured by the app factory
 logger = logging.getLogger(__name__)
 
 # Global constants
@@ -21,16 +21,13 @@ DEFAULT_LEARNING_RATE = 0.001
 CUDA_STREAM_PRIORITY = torch.cuda.Stream.priority_HIGH
 MAX_BATCH_SIZE = 32
 MIXED_PRECISION_DTYPE = torch.float16
+# FP16 Tensor Cores need every channel and feature width to be a multiple of 8;
+# model inputs are zero-padded up to this many channels
+CONV_CHANNEL_ALIGNMENT = 8
+NUM_LIQUID_LAYERS = 3  # Multiple liquid layers for enhanced dynamics
+CUDA_GRAPH_CACHE_SIZE = 8  # captured batch sizes kept; each holds its own memory pool
 
-@dataclass
-class LNNState:
-    """Data class for managing LNN state information"""
-    membrane_potential: torch.Tensor
-    synaptic_current: torch.Tensor
-    time_step: int
-    last_update: float
-
-class LiquidNeuralNetwork(tf.keras.Model):
+class LiquidNeuralNetwork(torch.nn.Module):
     """
     Advanced implementation of Liquid Neural Network optimized for wildlife and fossil detection.
     Implements dynamic time-varying states with parallel processing capabilities.
@@ -55,42 +52,101 @@ class LiquidNeuralNetwork(tf.keras.Model):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.cuda_stream = torch.cuda.Stream(priority=CUDA_STREAM_PRIORITY)
         
+        # CUDA graphs captured per fixed-size image batch shape for the inference path,
+        # least recently used evicted first
+        self._cuda_graphs = OrderedDict()
+        
+        # Staging buffers, liquid state and graph static buffers are shared, so
+        # only one thread may run inference at a time
+        self._model_lock = threading.RLock()
+        
+        # Double-buffered pinned host and device buffers for raw input uploads,
+        # copied on a separate stream so the next upload overlaps current compute
+        self._host_inputs = None
+        self._device_inputs = None
+        self._staging_slot = 0
+        if self.device.type == 'cuda':
+            self.copy_stream = torch.cuda.Stream()
+            self._upload_events = [torch.cuda.Event() for _ in range(2)]
+            self._consumed_events = [torch.cuda.Event() for _ in range(2)]
+        
+        # Storage dtype of the convolutional backbone; cast_backbone narrows it on GPU
+        self._backbone_dtype = torch.float32
+        
         # Initialize model components
         self._initialize_layers()
         self._setup_optimization()
         self._initialize_state_buffer()
         
+        # Fuse the elementwise liquid dynamics into one kernel; shapes are static per batch size
+        if self.device.type == 'cuda':
+            self._liquid_dynamics = torch.compile(
+                self._liquid_dynamics,
+                fullgraph=True,
+                dynamic=False
+            )
+        
         logger.info(f"LNN initialized on device: {self.device}")
         
     def _initialize_layers(self):
         """Initialize neural network layers with GPU optimization"""
-        # Base convolutional layers for feature extraction
-        self.feature_extractor = tf.keras.Sequential([
-            tf.keras.layers.Conv2D(64, 3, activation='relu', padding='same'),
-            tf.keras.layers.MaxPooling2D(),
-            tf.keras.layers.Conv2D(128, 3, activation='relu', padding='same'),
-            tf.keras.layers.MaxPooling2D(),
-            tf.keras.layers.Conv2D(256, 3, activation='relu', padding='same')
-        ])
+        # Keep the GEMM widths Tensor Core eligible (conv widths 64/128/256 and
+        # classifier widths 512/256 already are)
+        if self.config.layer_size % CONV_CHANNEL_ALIGNMENT:
+            raise ValueError(
+                f"layer_size must be a multiple of {CONV_CHANNEL_ALIGNMENT}: {self.config.layer_size}"
+            )
+        
+        # Base convolutional layers for feature extraction, pooled and projected
+        # to the liquid layer width
+        self.feature_extractor = torch.nn.Sequential(
+            torch.nn.Conv2d(CONV_CHANNEL_ALIGNMENT, 64, 3, padding=1),
+            torch.nn.ReLU(inplace=True),
+            torch.nn.MaxPool2d(2),
+            torch.nn.Conv2d(64, 128, 3, padding=1),
+            torch.nn.ReLU(inplace=True),
+            torch.nn.MaxPool2d(2),
+            torch.nn.Conv2d(128, 256, 3, padding=1),
+            torch.nn.ReLU(inplace=True),
+            torch.nn.AdaptiveAvgPool2d(1),
+            torch.nn.Flatten(),
+            torch.nn.Linear(256, self.config.layer_size)
+        ).to(self.device, memory_format=torch.channels_last)
         
-        # Liquid layer implementation
-        self.liquid_layer = torch.nn.ModuleList([
-            torch.nn.Linear(self.config.layer_size, self.config.layer_size)
-            for _ in range(3)  # Multiple liquid layers for enhanced dynamics
-        ]).to(self.device)
+        # Liquid layers stacked into one (layers, out, in) weight for a single batched GEMM
+        layer_size = self.config.layer_size
+        self.liquid_weight = torch.nn.Parameter(
+            torch.empty(NUM_LIQUID_LAYERS, layer_size, layer_size, device=self.device)
+        )
+        self.liquid_bias = torch.nn.Parameter(
+            torch.empty(NUM_LIQUID_LAYERS, layer_size, device=self.device)
+        )
+        for weight in self.liquid_weight.data:
+            torch.nn.init.kaiming_uniform_(weight, a=math.sqrt(5))
+        bound = 1 / math.sqrt(layer_size)
+        torch.nn.init.uniform_(self.liquid_bias, -bound, bound)
         
         # Output classification layers
-        self.classifier = tf.keras.Sequential([
-            tf.keras.layers.Dense(512, activation='relu'),
-            tf.keras.layers.Dropout(0.5),
-            tf.keras.layers.Dense(256, activation='relu'),
-            tf.keras.layers.Dense(1, activation='sigmoid')
-        ])
+        self.classifier = torch.nn.Sequential(
+            torch.nn.Linear(3 * self.config.layer_size, 512),
+            torch.nn.ReLU(inplace=True),
+            torch.nn.Dropout(0.5),
+            torch.nn.Linear(512, 256),
+            torch.nn.ReLU(inplace=True),
+            torch.nn.Linear(256, 1)
+        ).to(self.device)
+        
+        # Confidence threshold in logit space so predict can fuse sigmoid and threshold
+        threshold = self.config.confidence_threshold
+        self._logit_threshold = (
+            math.log(threshold / (1 - threshold)) if 0 < threshold < 1
+            else math.copysign(math.inf, threshold - 0.5)
+        )
         
     def _setup_optimization(self):
         """Configure optimization and mixed precision training"""
         self.optimizer = torch.optim.Adam(
-            self.liquid_layer.parameters(),
+            [self.liquid_weight, self.liquid_bias],
             lr=self.config.learning_rate,
             betas=(0.9, 0.999)
         )
@@ -99,35 +155,56 @@ class LiquidNeuralNetwork(tf.keras.Model):
         self.scaler = torch.cuda.amp.GradScaler()
         
     def _initialize_state_buffer(self):
-        """Initialize circular state buffer for neural dynamics"""
-        self.state_buffer = {}
+        """Initialize contiguous (batch, layer, neuron) state buffers for neural dynamics"""
+        self._allocate_state_buffer(MAX_BATCH_SIZE)
+        
+        # Integer update ticks kept on device so the hot path never syncs to host
+        self.step_counter = torch.zeros((), device=self.device)
+        self.last_update = torch.zeros((), device=self.device)
         self.reset_states()
         
-    @torch.cuda.amp.autocast()
+    def _allocate_state_buffer(self, batch_capacity: int) -> None:
+        """Allocate state buffers; batches use leading slices so addresses stay stable"""
+        # Captured CUDA graphs point at the old buffers; drop them before freeing
+        self._cuda_graphs.clear()
+        shape = (batch_capacity, NUM_LIQUID_LAYERS, self.config.layer_size)
+        self.membrane_potential = torch.zeros(shape, device=self.device)
+        self.synaptic_current = torch.zeros(shape, device=self.device)
+        
     def preprocess_input(self, image: np.ndarray) -> torch.Tensor:
         """
         Advanced preprocessing pipeline with dynamic augmentation.
         
         Args:
-            image (np.ndarray): Input image array
+            image (np.ndarray): Input image array (HWC or NHWC)
             
         Returns:
-            torch.Tensor: Preprocessed and GPU-optimized tensor
+            torch.Tensor: Preprocessed NCHW tensor on the model device
         """
         try:
             with self.cuda_stream:
-                # Convert to PIL for advanced preprocessing
-                if isinstance(image, np.ndarray):
-                    image = Image.fromarray(image)
+                # Without a GPU, resize on the host with cv2's SIMD kernels instead
+                target_size = (self.config.input_size, self.config.input_size)
+                if self.device.type == 'cpu':
+                    image = self._resize_on_host(image, target_size)
                 
-                # Resize and normalize
-                image = image.resize((self.config.input_size, self.config.input_size))
-                image_tensor = torch.from_numpy(np.array(image)).float()
-                image_tensor = image_tensor.permute(2, 0, 1)  # CHW format
+                # Move the raw pixels to the device once and convert them there
+                image_tensor = self._stage_input(image)
                 
-                # Normalize and move to GPU
-                image_tensor = image_tensor / 255.0
-                image_tensor = image_tensor.to(self.device, non_blocking=True)
+                # Resize on device
+                if tuple(image_tensor.shape[-2:]) != target_size:
+                    image_tensor = torch.nn.functional.interpolate(
+                        image_tensor,
+                        size=target_size,
+                        mode='bilinear',
+                        align_corners=False
+                    )
+                
+                # Pad channels to a tensor-core friendly width and keep an NHWC layout
+                pad_channels = -image_tensor.shape[1] % CONV_CHANNEL_ALIGNMENT
+                if pad_channels:
+                    image_tensor = torch.nn.functional.pad(image_tensor, (0, 0, 0, 0, 0, pad_channels))
+                image_tensor = image_tensor.contiguous(memory_format=torch.channels_last)
                 
                 return image_tensor
                 
@@ -135,7 +212,68 @@ class LiquidNeuralNetwork(tf.keras.Model):
             logger.error(f"Preprocessing error: {str(e)}")
             raise
             
-    @torch.cuda.amp.autocast()
+    def _stage_input(self, image: np.ndarray) -> torch.Tensor:
+        """Upload pixels on the copy stream and convert them to NCHW float on device"""
+        image_tensor = torch.from_numpy(np.ascontiguousarray(image))
+        if self.device.type == 'cuda':
+            slot = self._staging_slot
+            self._staging_slot ^= 1
+            image_tensor = self._upload_input(image_tensor, slot)
+        
+        # Accept HWC or NHWC input and convert to NCHW on device; only raw uint8
+        # pixels are scaled, float input is taken as already normalized
+        if image_tensor.dim() == 3:
+            image_tensor = image_tensor.unsqueeze(0)
+        is_uint8 = image_tensor.dtype == torch.uint8
+        image_tensor = image_tensor.permute(0, 3, 1, 2).float()
+        if is_uint8:
+            image_tensor = image_tensor.mul_(1.0 / 255.0)
+        
+        # The staging slot can be refilled once this conversion has read it
+        if self.device.type == 'cuda':
+            self._consumed_events[slot].record()
+        return image_tensor
+        
+    def _upload_input(self, image_tensor: torch.Tensor, slot: int) -> torch.Tensor:
+        """Copy pixels through double-buffered pinned staging so uploads overlap compute"""
+        if (
+            self._host_inputs is None
+            or self._host_inputs[0].shape != image_tensor.shape
+            or self._host_inputs[0].dtype != image_tensor.dtype
+        ):
+            self._host_inputs = [
+                torch.empty(image_tensor.shape, dtype=image_tensor.dtype, pin_memory=True)
+                for _ in range(2)
+            ]
+            self._device_inputs = [
+                torch.empty_like(host_input, device=self.device)
+                for host_input in self._host_inputs
+            ]
+        
+        host_input, device_input = self._host_inputs[slot], self._device_inputs[slot]
+        upload_event = self._upload_events[slot]
+        
+        # Wait for this slot's previous upload before overwriting its host buffer
+        upload_event.synchronize()
+        host_input.copy_(image_tensor)
+        with torch.cuda.stream(self.copy_stream):
+            # ...and for compute to finish reading its device buffer
+            self.copy_stream.wait_event(self._consumed_events[slot])
+            device_input.copy_(host_input, non_blocking=True)
+            upload_event.record(self.copy_stream)
+        
+        torch.cuda.current_stream().wait_event(upload_event)
+        return device_input
+        
+    def _resize_on_host(self, image: np.ndarray, target_size: Tuple[int, int]) -> np.ndarray:
+        """Resize an HWC image or NHWC batch with cv2 bilinear interpolation"""
+        if image.ndim == 3:
+            return cv2.resize(image, target_size, interpolation=cv2.INTER_LINEAR)
+        return np.stack([
+            cv2.resize(frame, target_size, interpolation=cv2.INTER_LINEAR)
+            for frame in image
+        ])
+        
     def update_states(self, current_input: torch.Tensor) -> None:
         """
         Update neural states with adaptive time constants.
@@ -145,34 +283,88 @@ class LiquidNeuralNetwork(tf.keras.Model):
         """
         try:
             with self.cuda_stream:
-                current_time = torch.cuda.Event().record()
+                batch_size = self.active_batch_size = current_input.shape[0]
+                if batch_size > self.membrane_potential.shape[0]:
+                    self._allocate_state_buffer(batch_size)
                 
-                # Update membrane potentials
-                for idx, layer in enumerate(self.liquid_layer):
-                    state = self.state_buffer.get(idx, self._create_initial_state())
-                    
-                    # Calculate time-varying dynamics
-                    dt = self._calculate_time_step(state.last_update, current_time)
-                    tau = self._get_adaptive_time_constant(state.membrane_potential)
-                    
-                    # Update neural states
-                    state.synaptic_current = layer(current_input)
-                    state.membrane_potential = self._update_membrane_potential(
-                        state.membrane_potential,
-                        state.synaptic_current,
-                        dt,
-                        tau
-                    )
-                    
-                    # Store updated state
-                    self.state_buffer[idx] = state
+                # Layer-major views over the batch-major buffers for the batched GEMM
+                membrane_potential = self.membrane_potential[:batch_size].transpose(0, 1)
+                synaptic_current = self.synaptic_current[:batch_size].transpose(0, 1)
+                
+                # Calculate time-varying dynamics for all layers at once
+                self.step_counter.add_(1)
+                dt = self._calculate_time_step(self.last_update, self.step_counter)
+                
+                # Update neural states in place; only the GEMM runs in reduced precision,
+                # in the caller's autocast dtype when one is active
+                gemm_dtype = (
+                    torch.get_autocast_gpu_dtype() if torch.is_autocast_enabled()
+                    else MIXED_PRECISION_DTYPE
+                )
+                with torch.cuda.amp.autocast(
+                    dtype=gemm_dtype,
+                    enabled=self.device.type == 'cuda'
+                ):
+                    synaptic_current.copy_(torch.baddbmm(
+                        self.liquid_bias.unsqueeze(1),
+                        current_input.expand(NUM_LIQUID_LAYERS, -1, -1),
+                        self.liquid_weight.transpose(1, 2)
+                    ))
+                membrane_potential.copy_(self._liquid_dynamics(
+                    membrane_potential,
+                    synaptic_current,
+                    dt
+                ))
+                self.last_update.copy_(self.step_counter)
+                self.time_step += 1
                     
         except Exception as e:
             logger.error(f"State update error: {str(e)}")
             raise
             
-    @tf.function(jit_compile=True)
-    def predict(self, input_tensor: Union[np.ndarray, torch.Tensor]) -> np.ndarray:
+    def forward(self, input_tensor: torch.Tensor) -> torch.Tensor:
+        """
+        Run feature extraction, liquid dynamics and classification on device.
+        
+        Args:
+            input_tensor (torch.Tensor): Preprocessed NCHW input tensor
+            
+        Returns:
+            torch.Tensor: Classification logits
+        """
+        return self.liquid_step(self.encode(input_tensor))
+        
+    def encode(self, input_tensor: torch.Tensor) -> torch.Tensor:
+        """
+        Run the stateless convolutional backbone.
+        
+        Features depend only on the input, so callers can compute them once per
+        image and feed them to liquid_step repeatedly.
+        
+        Args:
+            input_tensor (torch.Tensor): Preprocessed NCHW input tensor
+            
+        Returns:
+            torch.Tensor: (batch, layer_size) backbone features
+        """
+        features = self.feature_extractor(input_tensor.to(self._backbone_dtype))
+        return features.float()
+        
+    def liquid_step(self, features: torch.Tensor) -> torch.Tensor:
+        """
+        Advance the liquid state with backbone features and classify.
+        
+        Args:
+            features (torch.Tensor): Features from encode
+            
+        Returns:
+            torch.Tensor: Classification logits
+        """
+        self.update_states(features)
+        liquid_output = self._aggregate_liquid_states()
+        return self.classifier(liquid_output)
+        
+    def predict(self, input_tensor: Union[np.ndarray, torch.Tensor]) -> torch.Tensor:
         """
         Generate optimized predictions using parallel processing.
         
@@ -180,54 +372,150 @@ class LiquidNeuralNetwork(tf.keras.Model):
             input_tensor: Input data for prediction
             
         Returns:
-            np.ndarray: Prediction probabilities with confidence scores
+            torch.Tensor: Prediction probabilities with confidence scores, on the model device
         """
         try:
-            # Ensure input is preprocessed
-            if isinstance(input_tensor, np.ndarray):
-                input_tensor = self.preprocess_input(input_tensor)
-            
-            with torch.cuda.amp.autocast(), self.cuda_stream:
-                # Extract features
-                features = self.feature_extractor(input_tensor)
+            with self._model_lock, self.cuda_stream:
+                # Ensure input is preprocessed
+                if isinstance(input_tensor, np.ndarray):
+                    input_tensor = self.preprocess_input(input_tensor)
                 
-                # Process through liquid layers
-                self.update_states(features)
+                if self.device.type == 'cuda' and not self.training and self._is_graphable(input_tensor):
+                    logits = self._graphed_forward(input_tensor)
+                else:
+                    logits = self(input_tensor)
                 
-                # Generate predictions
-                liquid_output = self._aggregate_liquid_states()
-                predictions = self.classifier(liquid_output)
+                # Fuse sigmoid and confidence thresholding in one elementwise pass; this
+                # reads a graph's static output before the lock lets another replay in
+                predictions = torch.where(
+                    logits >= self._logit_threshold,
+                    torch.sigmoid(logits),
+                    logits.new_zeros(())
+                )
                 
-                # Apply confidence thresholding
-                confidence_mask = predictions >= self.config.confidence_threshold
-                predictions = predictions * tf.cast(confidence_mask, tf.float32)
-                
-                return predictions.numpy()
+                return predictions
                 
         except Exception as e:
             logger.error(f"Prediction error: {str(e)}")
             raise
             
+    def _is_graphable(self, input_tensor: torch.Tensor) -> bool:
+        """Only fixed-size image batches are graphed; variable-length inputs run eagerly"""
+        return (
+            input_tensor.dim() == 4
+            and tuple(input_tensor.shape[-2:]) == (self.config.input_size, self.config.input_size)
+            and input_tensor.shape[0] <= MAX_BATCH_SIZE
+        )
+        
+    def _snapshot_states(self) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, int]:
+        """Copy the liquid state so work that must not advance it can be undone"""
+        return (
+            self.membrane_potential.clone(),
+            self.synaptic_current.clone(),
+            self.step_counter.clone(),
+            self.last_update.clone(),
+            self.time_step
+        )
+        
+    def _restore_states(self, snapshot: Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, int]) -> None:
+        """Copy a snapshot back into the live state buffers in place"""
+        membrane_potential, synaptic_current, step_counter, last_update, time_step = snapshot
+        self.membrane_potential.copy_(membrane_potential)
+        self.synaptic_current.copy_(synaptic_current)
+        self.step_counter.copy_(step_counter)
+        self.last_update.copy_(last_update)
+        self.time_step = time_step
+        
+    @torch.inference_mode()
+    def _graphed_forward(self, input_tensor: torch.Tensor) -> torch.Tensor:
+        """Replay the CUDA graph captured for this input shape, capturing it on first use"""
+        key = tuple(input_tensor.shape)
+        if key not in self._cuda_graphs:
+            # Size the state buffers before capture so the graph never reallocates them
+            if key[0] > self.membrane_potential.shape[0]:
+                self._allocate_state_buffer(key[0])
+            static_input = input_tensor.clone()
+            
+            # Warm up on a side stream so lazy initialization stays out of the graph;
+            # the warm-up step is undone so only the replay below advances the state
+            snapshot = self._snapshot_states()
+            warmup_stream = torch.cuda.Stream()
+            warmup_stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(warmup_stream):
+                self(static_input)
+            torch.cuda.current_stream().wait_stream(warmup_stream)
+            self._restore_states(snapshot)
+            
+            # Capture records kernels without running them; only Python-side counters move
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                static_output = self(static_input)
+            self.time_step = snapshot[4]
+            
+            self._cuda_graphs[key] = (graph, static_input, static_output)
+            if len(self._cuda_graphs) > CUDA_GRAPH_CACHE_SIZE:
+                self._cuda_graphs.popitem(last=False)
+        
+        self._cuda_graphs.move_to_end(key)
+        graph, static_input, static_output = self._cuda_graphs[key]
+        static_input.copy_(input_tensor, non_blocking=True)
+        graph.replay()
+        self.time_step += 1
+        self.active_batch_size = key[0]
+        return static_output
+        
+    def quantize_classifier(self) -> None:
+        """Swap the classifier head for a dynamically quantized INT8 copy for inference"""
+        # Dynamic INT8 Linear kernels (fbgemm/qnnpack) are CPU-only
+        if self.device.type != 'cpu':
+            logger.info("Skipping INT8 classifier quantization on non-CPU device")
+            return
+        self.classifier = torch.ao.quantization.quantize_dynamic(
+            self.classifier.eval(),
+            {torch.nn.Linear},
+            dtype=torch.qint8
+        )
+        logger.info("Classifier head quantized to INT8")
+        
+    def cast_backbone(self, dtype: torch.dtype) -> None:
+        """Store the convolutional backbone in a reduced-precision dtype for inference"""
+        # Half-precision convolutions are only fast on GPU Tensor Cores
+        if self.device.type != 'cuda':
+            logger.info(f"Skipping {dtype} backbone cast on non-CUDA device")
+            return
+        self.feature_extractor.to(dtype)
+        self._backbone_dtype = dtype
+        # Captured graphs baked in the old weights and input casts
+        self._cuda_graphs.clear()
+        logger.info(f"Convolutional backbone cast to {dtype}")
+        
     def reset_states(self) -> None:
         """Reset all neural states to initial conditions"""
-        self.state_buffer.clear()
-        
-    def _create_initial_state(self) -> LNNState:
-        """Create initial state for a liquid layer"""
-        return LNNState(
-            membrane_potential=torch.zeros(self.config.layer_size).to(self.device),
-            synaptic_current=torch.zeros(self.config.layer_size).to(self.device),
-            time_step=0,
-            last_update=0.0
-        )
+        self.membrane_potential.zero_()
+        self.synaptic_current.zero_()
+        self.step_counter.zero_()
+        self.last_update.zero_()
+        self.time_step = 0
+        self.active_batch_size = 0
+        
+    def _liquid_dynamics(
+        self,
+        potential: torch.Tensor,
+        current: torch.Tensor,
+        dt: torch.Tensor
+    ) -> torch.Tensor:
+        """Advance membrane potentials one step with activity-dependent time constants"""
+        tau = self._get_adaptive_time_constant(potential)
+        return self._update_membrane_potential(potential, current, dt, tau)
         
-    def _calculate_time_step(self, last_update: float, current_time: float) -> float:
-        """Calculate adaptive time step based on update timing"""
-        return min(current_time - last_update, self.config.time_constants_range[1])
+    def _calculate_time_step(self, last_update: torch.Tensor, current_time: torch.Tensor) -> torch.Tensor:
+        """Calculate adaptive time step in update ticks, on device"""
+        return torch.clamp(current_time - last_update, max=self.config.time_constants_range[1])
         
-    def _get_adaptive_time_constant(self, membrane_potential: torch.Tensor) -> float:
-        """Calculate adaptive time constant based on neural activity"""
-        activity = torch.mean(torch.abs(membrane_potential))
+    def _get_adaptive_time_constant(self, membrane_potential: torch.Tensor) -> torch.Tensor:
+        """Calculate per-layer, per-sample adaptive time constants based on neural activity"""
+        # Reduce over neurons only, so co-batched requests never affect each other
+        activity = torch.mean(torch.abs(membrane_potential), dim=2, keepdim=True)
         min_tau, max_tau = self.config.time_constants_range
         return min_tau + (max_tau - min_tau) * torch.sigmoid(activity)
         
@@ -235,20 +523,19 @@ class LiquidNeuralNetwork(tf.keras.Model):
         self,
         potential: torch.Tensor,
         current: torch.Tensor,
-        dt: float,
-        tau: float
+        dt: torch.Tensor,
+        tau: torch.Tensor
     ) -> torch.Tensor:
         """Update membrane potential using exponential decay"""
         decay = torch.exp(-dt / tau)
-        return potential * decay + current * (1 - decay)
+        # potential * decay + current * (1 - decay) as a single lerp kernel
+        return torch.lerp(current, potential, decay)
         
     def _aggregate_liquid_states(self) -> torch.Tensor:
-        """Aggregate states from all liquid layers"""
-        states = [
-            state.membrane_potential
-            for state in self.state_buffer.values()
-        ]
-        return torch.cat(states, dim=-1)
+        """Aggregate states from all liquid layers into (batch, layers * neurons)"""
+        # Batch-major storage makes this a zero-copy view
+        batch_size = self.active_batch_size
+        return self.membrane_potential[:batch_size].view(batch_size, -1)
 
 # Module exports
 __all__ = ['LiquidNeuralNetwork']
\ No newline at end of file
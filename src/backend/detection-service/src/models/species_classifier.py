@@ -6,14 +6,17 @@ import logging
 from typing import List, Dict, Tuple, Optional, Union
 from dataclasses import dataclass
 from functools import wraps
+import time
+import queue
+import threading
 
 # Internal imports
-from .lnn_model import LiquidNeuralNetwork
-from ..utils.image_processing import preprocess_for_detection
+from .lnn_model import LiquidNeuralNetwork, CONV_CHANNEL_ALIGNMENT
+from ..utils.image_processing import preprocess_for_detection, preprocess_into, preprocess_batch_into
 from ..utils.model_utils import load_model, validate_model_performance
+from ..config import DEFAULT_COMPUTE_DTYPE
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Module logger; handlers are configured by the app factory
 logger = logging.getLogger(__name__)
 
 # Global constants
@@ -21,6 +24,8 @@ DEFAULT_CONFIDENCE_THRESHOLD = 0.85
 BATCH_SIZE = 32
 INPUT_SHAPE = (640, 640, 3)
 MAX_BATCH_SIZE = 128
+BATCH_BUFFER_BUCKETS = (8, 16, 32, 64, 128)
+BATCH_BUFFERS_PER_BUCKET = 2
 HARDWARE_CONFIGS = {
     "GPU": {
         "memory_limit": 1024,
@@ -37,6 +42,14 @@ HARDWARE_CONFIGS = {
         "batch_size": 128
     }
 }
+# Device compute dtype per configured precision; CUDA input buffers use it too.
+# int8 keeps float activations and runs the classifier head with INT8 weights.
+COMPUTE_DTYPES = {
+    "fp32": torch.float32,
+    "fp16": torch.float16,
+    "bf16": torch.bfloat16,
+    "int8": torch.float32
+}
 PERFORMANCE_THRESHOLDS = {
     "latency_ms": 100,
     "memory_mb": 1024,
@@ -50,16 +63,17 @@ class DetectionMetrics:
     confidence: float
     memory_usage: float
     batch_size: int
-    hardware_utilization: Dict[str, float]
+    hardware_utilization: Dict[str, Union[float, str]]
 
 def performance_monitored(func):
     """Decorator for monitoring detection performance"""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = tf.timestamp()
+        # Host-side clock; never waits on the device
+        start_time = time.perf_counter_ns()
         try:
             result = func(*args, **kwargs)
-            execution_time = (tf.timestamp() - start_time) * 1000
+            execution_time = (time.perf_counter_ns() - start_time) / 1e6
             
             if execution_time > PERFORMANCE_THRESHOLDS["latency_ms"]:
                 logger.warning(f"Detection latency threshold exceeded: {execution_time:.2f}ms")
@@ -98,7 +112,8 @@ class SpeciesClassifier:
         model_path: str,
         model_config: Dict,
         confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
-        hardware_config: Optional[Dict] = None
+        hardware_config: Optional[Dict] = None,
+        compute_dtype: str = DEFAULT_COMPUTE_DTYPE
     ):
         """
         Initialize species classifier with LNN model and hardware optimization.
@@ -108,11 +123,33 @@ class SpeciesClassifier:
             model_config: Model configuration parameters
             confidence_threshold: Minimum confidence threshold for detection
             hardware_config: Hardware-specific optimization settings
+            compute_dtype: Inference precision ('fp32', 'fp16', 'bf16' or 'int8')
         """
         try:
             self.confidence_threshold = confidence_threshold
             self.model_config = model_config
+            self._species_labels = np.asarray(model_config.get("species_labels", []))
             self.hardware_config = hardware_config or HARDWARE_CONFIGS["GPU"]
+            self._cuda = torch.cuda.is_available()
+            self.compute_dtype = compute_dtype
+            self._device_dtype = COMPUTE_DTYPES[compute_dtype]
+            
+            # INT8 inference is the dynamically quantized classifier head
+            if compute_dtype == "int8":
+                model_config = {
+                    **model_config,
+                    "model_quantization": {**model_config.get("model_quantization", {}), "type": "INT8"}
+                }
+            
+            # The LNN keeps shared staging, state buffers and CUDA graphs, so only
+            # one thread may run it at a time
+            self._model_lock = threading.Lock()
+            
+            # Recycled channel-padded batch buffers, allocated lazily per size bucket
+            self._batch_pool = {
+                bucket: queue.Queue(maxsize=BATCH_BUFFERS_PER_BUCKET)
+                for bucket in BATCH_BUFFER_BUCKETS
+            }
             
             # Initialize hardware acceleration
             self._setup_hardware_acceleration()
@@ -123,6 +160,7 @@ class SpeciesClassifier:
                 model_config,
                 self.hardware_config
             )
+            self._device = next(self.lnn_model.parameters()).device
             
             # Initialize performance monitoring
             self.metrics = DetectionMetrics(
@@ -130,7 +168,7 @@ class SpeciesClassifier:
                 confidence=0.0,
                 memory_usage=0.0,
                 batch_size=BATCH_SIZE,
-                hardware_utilization={}
+                hardware_utilization={"dtype": compute_dtype}
             )
             
             # Validate model performance
@@ -145,7 +183,7 @@ class SpeciesClassifier:
     def _setup_hardware_acceleration(self) -> None:
         """Configure hardware-specific optimizations"""
         try:
-            if torch.cuda.is_available():
+            if self._cuda:
                 torch.cuda.empty_cache()
                 torch.backends.cudnn.benchmark = True
                 torch.backends.cudnn.deterministic = False
@@ -155,7 +193,7 @@ class SpeciesClassifier:
                     self.scaler = torch.cuda.amp.GradScaler()
                     
             # Configure thread affinity for CPU
-            if not torch.cuda.is_available():
+            if not self._cuda:
                 tf.config.threading.set_inter_op_parallelism_threads(
                     self.hardware_config["CPU"]["num_threads"]
                 )
@@ -167,11 +205,6 @@ class SpeciesClassifier:
     def _validate_model_initialization(self) -> None:
         """Validate model performance and resource utilization"""
         try:
-            # Generate dummy input for validation
-            dummy_input = torch.randn(1, *INPUT_SHAPE).to(
-                next(self.lnn_model.parameters()).device
-            )
-            
             # Validate performance metrics
             metrics = validate_model_performance(
                 self.lnn_model,
@@ -203,26 +236,11 @@ class SpeciesClassifier:
             Tuple containing species name, confidence score, and metrics
         """
         try:
-            # Preprocess image
-            processed_image = preprocess_for_detection(
-                image,
-                augment=False,
-                processing_config={"batch_processing": False}
-            )
-            
-            # Generate prediction with hardware acceleration
-            with torch.cuda.amp.autocast(enabled=use_hardware_acceleration):
-                prediction = self.lnn_model.predict(processed_image)
-                confidence = float(prediction.max())
+            # Same normalized, channel-padded input path as batch_predict
+            confidences, species_ids = self._run_batch([image], use_hardware_acceleration)
+            species_name = self._resolve_labels(confidences, species_ids)[0]
                 
-                # Apply confidence thresholding
-                if confidence < self.confidence_threshold:
-                    return "Unknown", confidence, self._get_metrics()
-                
-                species_id = int(prediction.argmax())
-                species_name = self.model_config["species_labels"][species_id]
-                
-            return species_name, confidence, self._get_metrics()
+            return species_name, float(confidences[0]), self._get_metrics()
             
         except Exception as e:
             logger.error(f"Prediction error: {str(e)}")
@@ -233,7 +251,8 @@ class SpeciesClassifier:
     def batch_predict(
         self,
         images: List[np.ndarray],
-        enable_parallel: bool = True
+        enable_parallel: bool = True,
+        augment: bool = False
     ) -> List[Tuple[str, float, Dict]]:
         """
         Process multiple images with parallel processing and batch optimization.
@@ -241,6 +260,7 @@ class SpeciesClassifier:
         Args:
             images: List of input images
             enable_parallel: Whether to enable parallel processing
+            augment: Whether to apply augmentation during preprocessing
             
         Returns:
             List of tuples containing species names, confidences, and metrics
@@ -250,34 +270,14 @@ class SpeciesClassifier:
             if len(images) > MAX_BATCH_SIZE:
                 raise ValueError(f"Batch size exceeds maximum: {MAX_BATCH_SIZE}")
                 
-            # Preprocess batch
-            processed_images = [
-                preprocess_for_detection(
-                    img,
-                    augment=False,
-                    processing_config={"batch_processing": True}
-                )
-                for img in images
-            ]
-            
-            # Stack images for batch processing
-            batch = np.vstack(processed_images)
+            confidences, species_ids = self._run_batch(images, enable_parallel, augment)
             
-            # Generate batch predictions
-            with torch.cuda.amp.autocast(enabled=enable_parallel):
-                predictions = self.lnn_model.predict(batch)
-                confidences = predictions.max(axis=1)
-                species_ids = predictions.argmax(axis=1)
-                
-                # Process results
-                results = []
-                for idx, (species_id, confidence) in enumerate(zip(species_ids, confidences)):
-                    if confidence >= self.confidence_threshold:
-                        species_name = self.model_config["species_labels"][int(species_id)]
-                    else:
-                        species_name = "Unknown"
-                        
-                    results.append((species_name, float(confidence), self._get_metrics()))
+            species_names = self._resolve_labels(confidences, species_ids)
+            metrics = self._get_metrics()
+            results = [
+                (species_name, confidence, metrics)
+                for species_name, confidence in zip(species_names, confidences.tolist())
+            ]
                     
             return results
             
@@ -285,6 +285,97 @@ class SpeciesClassifier:
             logger.error(f"Batch prediction error: {str(e)}")
             raise
 
+    def _resolve_labels(self, confidences: np.ndarray, species_ids: np.ndarray) -> List[str]:
+        """Map class indices to species names; below-threshold or unlabeled rows are 'Unknown'"""
+        # Only index rows that pass the threshold and have a label
+        known = (confidences >= self.confidence_threshold) & (species_ids < len(self._species_labels))
+        species_names = np.full(len(species_ids), "Unknown", dtype=object)
+        species_names[known] = self._species_labels[species_ids[known]]
+        return [str(name) for name in species_names]
+
+    def _run_batch(
+        self,
+        images: List[np.ndarray],
+        use_autocast: bool,
+        augment: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Preprocess images into a pooled input buffer and run one forward pass.
+        
+        Args:
+            images: Input image arrays
+            use_autocast: Whether to run the forward pass under autocast
+            augment: Whether to apply augmentation during preprocessing
+            
+        Returns:
+            Tuple of per-image confidences and class indices
+        """
+        # Preprocess straight into a recycled pinned, channel-padded NHWC buffer
+        bucket, host_batch = self._acquire_batch_buffer(len(images))
+        upload_done = torch.cuda.Event() if self._cuda else None
+        try:
+            # Rows are written in the buffer dtype directly; NumPy cannot view bfloat16
+            if host_batch.dtype != torch.bfloat16:
+                rows = host_batch.numpy()[:len(images), ..., :INPUT_SHAPE[-1]]
+                if len(images) == 1:
+                    preprocess_into(images[0], rows[0], augment=augment)
+                else:
+                    preprocess_batch_into(images, rows, augment=augment)
+            else:
+                for idx, img in enumerate(images):
+                    processed = preprocess_for_detection(
+                        img,
+                        augment=augment,
+                        processing_config={"batch_processing": True}
+                    )
+                    host_batch[idx, ..., :processed.shape[-1]].copy_(torch.from_numpy(processed[0]))
+            
+            # Preprocessing runs concurrently; upload and inference are serialized
+            with self._model_lock:
+                # Single H2D transfer, then an NCHW channels_last view for the model
+                batch = host_batch[:len(images)].to(self._device, non_blocking=True).permute(0, 3, 1, 2)
+                if upload_done is not None:
+                    upload_done.record()
+                
+                # Run in the configured compute dtype; without autocast the
+                # reduced-precision buffer is widened to match the float weights
+                autocast_enabled = use_autocast and self._cuda and self._device_dtype != torch.float32
+                if not autocast_enabled:
+                    batch = batch.float()
+                with torch.cuda.amp.autocast(enabled=autocast_enabled, dtype=self._device_dtype):
+                    predictions = self.lnn_model.predict(batch)
+                confidences, species_ids = predictions.max(dim=1)
+                confidences = confidences.float().cpu().numpy()
+                species_ids = species_ids.cpu().numpy()
+        finally:
+            # The host buffer may only be reused once its upload has finished
+            if upload_done is not None:
+                upload_done.synchronize()
+            self._release_batch_buffer(bucket, host_batch)
+        
+        return confidences, species_ids
+
+    def _acquire_batch_buffer(self, batch_size: int) -> Tuple[int, torch.Tensor]:
+        """Take a zero-padded host batch buffer of at least batch_size rows from the pool"""
+        bucket = next(size for size in BATCH_BUFFER_BUCKETS if size >= batch_size)
+        try:
+            return bucket, self._batch_pool[bucket].get_nowait()
+        except queue.Empty:
+            # Padding channels are zeroed once here and never written afterwards
+            height, width = INPUT_SHAPE[:2]
+            return bucket, torch.zeros(
+                (bucket, height, width, CONV_CHANNEL_ALIGNMENT),
+                dtype=self._device_dtype if self._cuda else torch.float32,
+                pin_memory=self._cuda
+            )
+
+    def _release_batch_buffer(self, bucket: int, buffer: torch.Tensor) -> None:
+        """Return a batch buffer to its pool, dropping it if the pool is full"""
+        try:
+            self._batch_pool[bucket].put_nowait(buffer)
+        except queue.Full:
+            pass
+
     def _get_metrics(self) -> Dict:
         """Collect current performance metrics"""
         try:
@@ -296,7 +387,7 @@ class SpeciesClassifier:
                 "hardware_utilization": self.metrics.hardware_utilization
             }
             
-            if torch.cuda.is_available():
+            if self._cuda:
                 metrics["gpu_memory"] = torch.cuda.max_memory_allocated() / 1024**2
                 
             return metrics
@@ -1,24 +1,28 @@
 # External imports with versions
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, BackgroundTasks  # version: 0.100.0
 from fastapi.responses import JSONResponse  # version: 0.100.0
-from pydantic import BaseModel, Field, validator  # version: 2.0.0
+from pydantic import BaseModel, ConfigDict, Field, field_validator  # version: 2.0.0
 import numpy as np  # version: 1.24.0
-from PIL import Image  # version: 10.0.0
+from PIL import Image, ImageOps  # version: 10.0.0
 from opentelemetry import trace  # version: 1.20.0
-from circuitbreaker import circuit  # version: 1.4.0
+import xxhash  # version: 3.4.1
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from collections import OrderedDict
 import io
 import time
 import uuid
+import asyncio
+import mmap
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 # Internal imports
 from ..services.detection_service import DetectionService
-from ..utils.image_processing import load_image, preprocess_for_detection
+from ..utils.image_processing import load_image, TARGET_SIZE
 from ..config import MLConfig, APIConfig
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Module logger; handlers are configured by the app factory
 logger = logging.getLogger(__name__)
 
 # Initialize router with prefix and tags
@@ -30,43 +34,195 @@ MAX_BATCH_SIZE = 32
 DETECTION_TIMEOUT = 100  # milliseconds
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 CORRELATION_ID_HEADER = "X-Correlation-ID"
+DECODE_WORKERS = 8
+SCAN_READ_CHUNK_SIZE = 1 << 20  # 1MB
+PIPELINE_QUEUE_SIZE = 4
+PIPELINE_CHUNK_SIZE = 8
+PIPELINE_FLUSH_WINDOW = 0.005  # seconds to wait for a partial chunk to fill
+REQUEST_LRU_CAPACITY = 256
+REQUEST_LRU_TTL = 30.0  # seconds a cached species result may be served
+BATCH_READ_CONCURRENCY = 8  # uploads read at once per batch request
+
+# Bounded pool for CPU-bound image decoding off the event loop
+decode_pool = ThreadPoolExecutor(max_workers=DECODE_WORKERS, thread_name_prefix="image-decode")
 
 # Initialize tracer
 tracer = trace.get_tracer(__name__)
 
+# Recent species results keyed by upload bytes, so client retries skip decode and inference.
+# Entries carry their insertion time and belong to the classifier that produced them.
+_request_lru: "OrderedDict[tuple, Tuple[float, Dict]]" = OrderedDict()
+_request_lru_model: Any = None
+
 # Pydantic models for request/response validation
 class DetectionOptions(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid', str_strip_whitespace=True)
+    
     enhance_detection: bool = Field(default=False, description="Enable enhanced detection mode")
     generate_3d: bool = Field(default=False, description="Generate 3D model for fossils")
     confidence_threshold: float = Field(default=0.90, ge=0.0, le=1.0)
     correlation_id: Optional[str] = Field(default=None)
-    
-    @validator('confidence_threshold')
-    def validate_confidence(cls, v):
-        if not 0.0 <= v <= 1.0:
-            raise ValueError("Confidence threshold must be between 0.0 and 1.0")
-        return v
 
 class BatchDetectionRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid', str_strip_whitespace=True)
+    
     process_type: str = Field(..., description="Type of detection: 'species' or 'fossil'")
     options: DetectionOptions
     correlation_ids: List[str] = Field(default_factory=list)
 
-    @validator('process_type')
+    @field_validator('process_type', mode='after')
+    @classmethod
     def validate_process_type(cls, v):
         if v not in ['species', 'fossil']:
             raise ValueError("Process type must be either 'species' or 'fossil'")
         return v
 
-# Circuit breaker configuration
-@circuit(failure_threshold=5, recovery_timeout=30)
+def _decode_into(image_data: bytes, out: np.ndarray) -> None:
+    """Decode, letterbox to TARGET_SIZE and write an RGB image into a preallocated slot"""
+    image = Image.fromarray(load_image(image_data, validate_content=False))
+    image = ImageOps.pad(image, TARGET_SIZE, method=Image.BILINEAR)
+    np.copyto(out, np.asarray(image, dtype=np.uint8))
+
+async def _map_scan_upload(upload: UploadFile) -> np.ndarray:
+    """Spool an upload to an anonymous temp file and view it as float32 through mmap"""
+    with tempfile.TemporaryFile() as spool:
+        while chunk := await upload.read(SCAN_READ_CHUNK_SIZE):
+            spool.write(chunk)
+        spool.flush()
+        
+        # The mapping outlives the file object and is released with the last array view
+        scan_map = mmap.mmap(spool.fileno(), 0, prot=mmap.PROT_READ)
+    return np.frombuffer(scan_map, dtype=np.float32)
+
+async def _pipelined_species_batch(
+    files: List[UploadFile],
+    detection_service: DetectionService,
+    enhance_detection: bool
+) -> List[Dict]:
+    """
+    Read, decode and detect a species batch as an overlapping three-stage pipeline.
+    
+    Uploads are read and decoded into rows of one preallocated uint8 batch while
+    earlier rows are already being classified. Chunks are classified one at a
+    time so the batch never holds more than one model call in flight.
+    
+    Args:
+        files: Uploaded image files
+        detection_service: Detection service instance
+        enhance_detection: Whether to apply detection enhancements
+        
+    Returns:
+        Detection results for the successfully decoded files, in upload order
+    """
+    batch = np.empty((len(files), TARGET_SIZE[1], TARGET_SIZE[0], 3), dtype=np.uint8)
+    decoded_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    read_slots = asyncio.Semaphore(BATCH_READ_CONCURRENCY)
+    loop = asyncio.get_running_loop()
+    
+    async def read_and_decode(idx: int, file: UploadFile) -> None:
+        # Stages A and B: bounded network read, then decode on the thread pool into row idx
+        try:
+            async with read_slots:
+                file_data = await file.read()
+            await loop.run_in_executor(decode_pool, _decode_into, file_data, batch[idx])
+        except Exception as e:
+            logger.exception("File processing error")
+            idx = None
+        await decoded_queue.put(idx)
+    
+    producers = [asyncio.create_task(read_and_decode(idx, file)) for idx, file in enumerate(files)]
+    
+    # Stage C: classify full chunks immediately, partial ones after a short window;
+    # producers keep decoding while a chunk is being classified
+    results = {}
+    ready = []
+    
+    async def flush() -> None:
+        nonlocal ready
+        if ready:
+            rows = sorted(ready)
+            ready = []
+            results.update(zip(rows, await detection_service.batch_process(
+                batch[rows],
+                process_type='species',
+                enhance_detection=enhance_detection
+            )))
+    
+    try:
+        for _ in range(len(files)):
+            try:
+                idx = await asyncio.wait_for(decoded_queue.get(), PIPELINE_FLUSH_WINDOW if ready else None)
+            except asyncio.TimeoutError:
+                await flush()
+                idx = await decoded_queue.get()
+            if idx is not None:
+                ready.append(idx)
+            if len(ready) >= PIPELINE_CHUNK_SIZE:
+                await flush()
+        await flush()
+    finally:
+        # On a failed chunk, stop the remaining reads instead of leaving them running
+        for producer in producers:
+            producer.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+    
+    # Results in upload order
+    return [results[idx] for idx in sorted(results)]
+
+def clear_request_cache() -> None:
+    """Drop all cached species detection results"""
+    _request_lru.clear()
+
+def _request_lru_bind_model(model: Any) -> None:
+    """Clear cached results when a newly loaded classifier starts serving"""
+    global _request_lru_model
+    if model is not _request_lru_model:
+        clear_request_cache()
+        _request_lru_model = model
+
+def _request_lru_get(key: tuple) -> Optional[Dict]:
+    """Return a fresh cached species detection result and mark it most recently used"""
+    entry = _request_lru.get(key)
+    if entry is None:
+        return None
+    cached_at, result = entry
+    if time.monotonic() - cached_at > REQUEST_LRU_TTL:
+        del _request_lru[key]
+        return None
+    _request_lru.move_to_end(key)
+    return result
+
+def _request_lru_put(key: tuple, result: Dict) -> None:
+    """Cache a species detection result, evicting the least recently used entry"""
+    _request_lru[key] = (time.monotonic(), result)
+    _request_lru.move_to_end(key)
+    if len(_request_lru) > REQUEST_LRU_CAPACITY:
+        _request_lru.popitem(last=False)
+
+async def _read_scan_batch(files: List[UploadFile]) -> List[np.ndarray]:
+    """Read scan uploads concurrently, a bounded number at a time, skipping failed files"""
+    read_slots = asyncio.Semaphore(BATCH_READ_CONCURRENCY)
+    
+    async def read_scan(file: UploadFile) -> np.ndarray:
+        async with read_slots:
+            file_data = await file.read()
+        return np.frombuffer(file_data, dtype=np.float32)
+    
+    scans = []
+    for scan in await asyncio.gather(*[read_scan(file) for file in files], return_exceptions=True):
+        if isinstance(scan, Exception):
+            logger.error("File processing error", exc_info=scan)
+            continue
+        scans.append(scan)
+    return scans
+
 async def protected_detect_species(
     detection_service: DetectionService,
     image_data: np.ndarray,
     options: DetectionOptions
 ) -> Dict:
-    """Protected species detection with circuit breaker pattern"""
-    return await detection_service.detect_species(
+    """Species detection guarded by the service's circuit breaker, checked per micro-batch"""
+    return await detection_service.submit_species(
         image_data,
         enhance_detection=options.enhance_detection,
         trace_id=options.correlation_id
@@ -95,10 +251,15 @@ async def detect_species(
         with tracer.start_as_current_span("detect_species") as span:
             # Validate correlation ID
             correlation_id = options.correlation_id or str(uuid.uuid4())
-            span.set_attribute("correlation_id", correlation_id)
+            file_size = await image_file.size()
+            span.set_attributes({
+                "correlation_id": correlation_id,
+                "enhance_detection": options.enhance_detection,
+                "file_size": file_size
+            })
             
             # Validate file size and format
-            if await image_file.size() > MAX_FILE_SIZE:
+            if file_size > MAX_FILE_SIZE:
                 raise HTTPException(
                     status_code=413,
                     detail="File size exceeds maximum limit"
@@ -111,35 +272,48 @@ async def detect_species(
                     detail="Unsupported image format"
                 )
             
-            # Load and preprocess image
+            # Load image; preprocessing happens once per micro-batch in the service
             start_time = time.perf_counter()
-            try:
-                image_data = await image_file.read()
-                image_array = load_image(image_data, validate_content=True)
-                processed_image = preprocess_for_detection(
-                    image_array,
-                    augment=options.enhance_detection
-                )
-            except Exception as e:
-                logger.error(f"Image processing error: {str(e)}")
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid image data"
-                )
+            image_data = await image_file.read()
+            request_key = (xxhash.xxh3_64_intdigest(image_data), options.enhance_detection)
             
-            # Perform detection with circuit breaker
-            try:
-                detection_result = await protected_detect_species(
-                    detection_service,
-                    processed_image,
-                    options
-                )
-            except Exception as e:
-                logger.error(f"Detection error: {str(e)}")
-                raise HTTPException(
-                    status_code=503,
-                    detail="Detection service temporarily unavailable"
-                )
+            # Cached results never outlive the model that produced them, and an open
+            # breaker is reported instead of being masked by the cache
+            _request_lru_bind_model(detection_service.species_classifier)
+            detection_result = (
+                _request_lru_get(request_key)
+                if detection_service.circuit_breaker.is_available()
+                else None
+            )
+            span.set_attribute("request_cache_hit", detection_result is not None)
+            
+            if detection_result is None:
+                try:
+                    image_array = load_image(image_data, validate_content=True)
+                except Exception as e:
+                    logger.exception("Image processing error")
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Invalid image data"
+                    )
+                
+                # Perform micro-batched detection with circuit breaker
+                try:
+                    detection_result = await protected_detect_species(
+                        detection_service,
+                        image_array,
+                        options
+                    )
+                except HTTPException:
+                    # Rate limiting (429) and open-breaker (503) responses pass through
+                    raise
+                except Exception as e:
+                    logger.exception("Detection error")
+                    raise HTTPException(
+                        status_code=503,
+                        detail="Detection service temporarily unavailable"
+                    )
+                _request_lru_put(request_key, detection_result)
             
             # Calculate processing time
             processing_time = (time.perf_counter() - start_time) * 1000
@@ -166,8 +340,10 @@ async def detect_species(
                 headers={"X-Correlation-ID": correlation_id}
             )
             
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Endpoint error: {str(e)}")
+        logger.exception("Endpoint error")
         raise HTTPException(
             status_code=500,
             detail="Internal server error"
@@ -196,10 +372,15 @@ async def detect_fossil(
         with tracer.start_as_current_span("detect_fossil") as span:
             # Validate correlation ID
             correlation_id = options.correlation_id or str(uuid.uuid4())
-            span.set_attribute("correlation_id", correlation_id)
+            file_size = await scan_data.size()
+            span.set_attributes({
+                "correlation_id": correlation_id,
+                "generate_3d": options.generate_3d,
+                "file_size": file_size
+            })
             
             # Validate file size
-            if await scan_data.size() > MAX_FILE_SIZE:
+            if file_size > MAX_FILE_SIZE:
                 raise HTTPException(
                     status_code=413,
                     detail="Scan data size exceeds maximum limit"
@@ -208,10 +389,9 @@ async def detect_fossil(
             # Process scan data
             start_time = time.perf_counter()
             try:
-                scan_array = await scan_data.read()
-                scan_array = np.frombuffer(scan_array, dtype=np.float32)
+                scan_array = await _map_scan_upload(scan_data)
             except Exception as e:
-                logger.error(f"Scan processing error: {str(e)}")
+                logger.exception("Scan processing error")
                 raise HTTPException(
                     status_code=400,
                     detail="Invalid scan data format"
@@ -224,7 +404,7 @@ async def detect_fossil(
                     generate_3d=options.generate_3d
                 )
             except Exception as e:
-                logger.error(f"Fossil detection error: {str(e)}")
+                logger.exception("Fossil detection error")
                 raise HTTPException(
                     status_code=503,
                     detail="Detection service temporarily unavailable"
@@ -259,7 +439,7 @@ async def detect_fossil(
             )
             
     except Exception as e:
-        logger.error(f"Endpoint error: {str(e)}")
+        logger.exception("Endpoint error")
         raise HTTPException(
             status_code=500,
             detail="Internal server error"
@@ -286,6 +466,11 @@ async def batch_detect(
     """
     try:
         with tracer.start_as_current_span("batch_detect") as span:
+            span.set_attributes({
+                "process_type": request.process_type,
+                "batch_size": len(files)
+            })
+            
             # Validate batch size
             if len(files) > MAX_BATCH_SIZE:
                 raise HTTPException(
@@ -295,34 +480,24 @@ async def batch_detect(
             
             # Process files in batch
             start_time = time.perf_counter()
-            processed_data = []
-            
-            for idx, file in enumerate(files):
-                try:
-                    file_data = await file.read()
-                    if request.process_type == 'species':
-                        image_array = load_image(file_data, validate_content=True)
-                        processed_data.append(
-                            preprocess_for_detection(
-                                image_array,
-                                augment=request.options.enhance_detection
-                            )
-                        )
-                    else:
-                        scan_array = np.frombuffer(file_data, dtype=np.float32)
-                        processed_data.append(scan_array)
-                except Exception as e:
-                    logger.error(f"File processing error: {str(e)}")
-                    continue
-            
-            # Perform batch detection
             try:
-                batch_results = await detection_service.batch_process(
-                    processed_data,
-                    process_type=request.process_type
-                )
+                if request.process_type == 'species':
+                    # Overlap upload reads, decoding and inference
+                    batch_results = await _pipelined_species_batch(
+                        files,
+                        detection_service,
+                        request.options.enhance_detection
+                    )
+                else:
+                    processed_data = await _read_scan_batch(files)
+                    
+                    # Perform batch detection
+                    batch_results = await detection_service.batch_process(
+                        processed_data,
+                        process_type=request.process_type
+                    )
             except Exception as e:
-                logger.error(f"Batch processing error: {str(e)}")
+                logger.exception("Batch processing error")
                 raise HTTPException(
                     status_code=503,
                     detail="Detection service temporarily unavailable"
@@ -349,11 +524,11 @@ async def batch_detect(
             return JSONResponse(content=response)
             
     except Exception as e:
-        logger.error(f"Endpoint error: {str(e)}")
+        logger.exception("Endpoint error")
         raise HTTPException(
             status_code=500,
             detail="Internal server error"
         )
 
 # Export router
-__all__ = ['router']
\ No newline at end of file
+__all__ = ['router', 'clear_request_cache']
\ No newline at end of file
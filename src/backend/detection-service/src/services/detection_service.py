@@ -4,21 +4,26 @@ from fastapi import HTTPException  # version: 0.100.0
 from pydantic import BaseModel  # version: 2.0.0
 from PIL import Image  # version: 10.0.0
 from opentelemetry import trace  # version: 1.20.0
-import redis  # version: 4.6.0
+from redis import asyncio as aioredis  # version: 4.6.0
+import xxhash  # version: 3.4.1
+import msgpack  # version: 1.0.7
+import msgpack_numpy  # version: 0.4.8
 import logging
 from typing import Dict, List, Optional, Tuple, Union
 from functools import wraps
 import time
-import json
+import asyncio
 
 # Internal imports
 from ..models.species_classifier import SpeciesClassifier
 from ..models.fossil_detector import FossilDetector
-from ..utils.image_processing import preprocess_image
-from ..config import MLConfig, APIConfig
+from ..utils.image_processing import preprocess_image, normalize_image
+from ..config import MLConfig, APIConfig, DEFAULT_COMPUTE_DTYPE
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Let msgpack encode NumPy arrays and scalars natively
+msgpack_numpy.patch()
+
+# Module logger; handlers are configured by the app factory
 logger = logging.getLogger(__name__)
 
 # Global constants
@@ -30,6 +35,64 @@ CACHE_TTL = 3600
 RATE_LIMIT = 1000
 CIRCUIT_BREAKER_THRESHOLD = 0.5
 TRACE_SAMPLING_RATE = 0.1
+RATE_LIMIT_WINDOW = 60  # seconds
+MICRO_BATCH_WINDOW = 0.005  # seconds to wait for concurrent requests to join a batch
+BATCH_SIZE_BUCKETS = (4, 8, 16, 32, 64, 128)
+BATCH_LATENCY_BUDGET = 0.8 * PROCESSING_TIMEOUT  # ms
+LATENCY_EWMA_ALPHA = 0.2
+LATENCY_EWMA_HALF_LIFE = 30.0  # seconds; stale estimates decay so larger buckets get re-probed
+MODEL_CONCURRENCY = 1  # the LNN is stateful; one batch on the model at a time
+RATE_LIMIT_SYNC_INTERVAL = 50  # local admissions between shared Redis reconciliations
+
+# INCRBY, first-hit EXPIRE and the window's remaining TTL in one server-side call
+# (one round trip)
+RATE_LIMIT_SCRIPT = """
+local current = redis.call('INCRBY', KEYS[1], ARGV[2])
+if current == tonumber(ARGV[2]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return {current, redis.call('TTL', KEYS[1])}
+"""
+
+class TokenBucket:
+    """In-process token bucket; the event loop serializes access, so no locking is needed"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        # Local admissions since the last shared reconciliation, and the monotonic
+        # time until which the shared counter has this bucket blocked
+        self.admissions = 0
+        self.blocked_until = 0.0
+    
+    def try_consume(self, tokens: float = 1) -> bool:
+        """Refill for elapsed time and take tokens if available"""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return False
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+    
+    def block(self, seconds: float) -> None:
+        """Drain the bucket and reject everything for the given number of seconds"""
+        self.tokens = 0.0
+        self.blocked_until = time.monotonic() + seconds
+
+def _tensor_key(array: np.ndarray) -> int:
+    """Hash an array's raw buffer without copying it"""
+    return xxhash.xxh3_64_intdigest(np.ascontiguousarray(array).view(np.uint8))
+
+def _cache_key_part(value) -> str:
+    """Render one call argument for a cache key, hashing arrays by content"""
+    if isinstance(value, np.ndarray):
+        return f"{_tensor_key(value):x}"
+    return repr(value)
 
 def monitored(func):
     """Decorator for comprehensive performance monitoring"""
@@ -43,43 +106,39 @@ def monitored(func):
                 result = func(self, *args, **kwargs)
                 execution_time = (time.perf_counter() - start_time) * 1000
                 
-                # Record metrics
-                span.set_attribute("execution_time_ms", execution_time)
-                span.set_attribute("success", True)
+                # Record metrics; unsampled spans skip attribute work entirely
+                if span.is_recording():
+                    span.set_attributes({"execution_time_ms": execution_time, "success": True})
                 
                 if execution_time > PROCESSING_TIMEOUT:
-                    logger.warning(f"{func.__name__} exceeded timeout: {execution_time:.2f}ms")
+                    logger.warning("%s exceeded timeout: %.2fms", func.__name__, execution_time)
                     
                 self.metrics.record_latency(func.__name__, execution_time)
                 return result
                 
             except Exception as e:
-                span.set_attribute("success", False)
-                span.record_exception(e)
-                logger.error(f"Error in {func.__name__}: {str(e)}")
+                if span.is_recording():
+                    span.set_attribute("success", False)
+                    span.record_exception(e)
                 raise
     return wrapper
 
 def cached(func):
     """Decorator for result caching with TTL"""
     @wraps(func)
-    def wrapper(self, *args, **kwargs):
-        cache_key = f"{func.__name__}:{hash(str(args))}"
+    async def wrapper(self, *args, **kwargs):
+        cache_key = ":".join([func.__name__, *map(_cache_key_part, args)])
         
         # Check cache
-        cached_result = self.cache_client.get(cache_key)
-        if cached_result:
-            return json.loads(cached_result)
+        cached_result = await self._cache_get(cache_key)
+        if cached_result is not None:
+            return cached_result
             
         # Execute function
-        result = func(self, *args, **kwargs)
+        result = await func(self, *args, **kwargs)
         
         # Cache result
-        self.cache_client.setex(
-            cache_key,
-            CACHE_TTL,
-            json.dumps(result)
-        )
+        await self._cache_set(cache_key, result)
         
         return result
     return wrapper
@@ -87,20 +146,9 @@ def cached(func):
 def rate_limited(func):
     """Decorator for rate limiting"""
     @wraps(func)
-    def wrapper(self, *args, **kwargs):
-        key = f"rate_limit:{func.__name__}"
-        current = self.cache_client.incr(key)
-        
-        if current == 1:
-            self.cache_client.expire(key, 60)  # Reset after 60 seconds
-            
-        if current > RATE_LIMIT:
-            raise HTTPException(
-                status_code=429,
-                detail="Rate limit exceeded"
-            )
-            
-        return func(self, *args, **kwargs)
+    async def wrapper(self, *args, **kwargs):
+        await self._check_rate_limit(func.__name__)
+        return await func(self, *args, **kwargs)
     return wrapper
 
 class DetectionService:
@@ -112,7 +160,7 @@ class DetectionService:
     def __init__(
         self,
         config: Dict,
-        cache_client: redis.Redis,
+        cache_client: aioredis.Redis,
         metrics: 'MetricsCollector'
     ):
         """
@@ -120,7 +168,7 @@ class DetectionService:
         
         Args:
             config: Service configuration dictionary
-            cache_client: Redis cache client
+            cache_client: Async Redis cache client
             metrics: Metrics collection instance
         """
         try:
@@ -128,12 +176,21 @@ class DetectionService:
             self.cache_client = cache_client
             self.metrics = metrics
             
-            # Initialize ML models
+            # Configure feature flags
+            self.feature_flags = config.get('feature_flags', {})
+            
+            # Initialize ML models; reduced precision can be switched off by flag
+            compute_dtype = (
+                config.get('compute_dtype', DEFAULT_COMPUTE_DTYPE)
+                if self.feature_flags.get('reduced_precision', True)
+                else 'fp32'
+            )
             self.species_classifier = SpeciesClassifier(
                 model_path=config['species_model_path'],
                 model_config=config['species_model_config'],
                 confidence_threshold=DEFAULT_CONFIDENCE_THRESHOLD,
-                hardware_config=config.get('hardware_config')
+                hardware_config=config.get('hardware_config'),
+                compute_dtype=compute_dtype
             )
             
             self.fossil_detector = FossilDetector(
@@ -145,15 +202,79 @@ class DetectionService:
             self.tracer = trace.get_tracer(__name__)
             self.circuit_breaker = self._initialize_circuit_breaker()
             
-            # Configure feature flags
-            self.feature_flags = config.get('feature_flags', {})
+            # Health probes reuse one model-dtype input instead of allocating per call
+            self._health_check_input = np.zeros((1, 640, 640, 3), dtype=np.float32)
+            
+            # Compile the fused normalization kernel before the first request
+            normalize_image(np.zeros((1, 1, 3), dtype=np.uint8))
+            
+            # Micro-batching queues bucketed by enhance_detection, drained by a
+            # background task started on first submission
+            self._pending = {False: [], True: []}
+            self._batch_event = asyncio.Event()
+            self._batcher_task = None
+            
+            # Per-function local rate limit buckets, reconciled with Redis periodically
+            self._rate_buckets = {}
+            
+            # Batch latency EWMA (ms) per batch-size bucket for adaptive batch sizing,
+            # with the monotonic time of each bucket's last measurement
+            self._batch_latency_ewma = dict.fromkeys(BATCH_SIZE_BUCKETS, 0.0)
+            self._batch_latency_updated = dict.fromkeys(BATCH_SIZE_BUCKETS, 0.0)
+            self._model_semaphore = asyncio.Semaphore(MODEL_CONCURRENCY)
             
             logger.info("Detection service initialized successfully")
             
         except Exception as e:
-            logger.error(f"Initialization error: {str(e)}")
+            logger.exception("Initialization error")
             raise
 
+    async def _check_rate_limit(self, name: str) -> None:
+        """Admit one call against the named token bucket, raising 429 when exhausted"""
+        bucket = self._rate_buckets.get(name)
+        if bucket is None:
+            bucket = self._rate_buckets[name] = TokenBucket(
+                rate=RATE_LIMIT / RATE_LIMIT_WINDOW,
+                capacity=RATE_LIMIT
+            )
+        
+        # Admit locally; every Nth admission of this bucket reconciles the shared
+        # counter, and a cross-pod total over the limit blocks the bucket for the
+        # rest of the shared window
+        admitted = bucket.try_consume()
+        if admitted:
+            bucket.admissions += 1
+            if bucket.admissions >= RATE_LIMIT_SYNC_INTERVAL:
+                key = f"rate_limit:{name}"
+                current, ttl = await self.cache_client.eval(
+                    RATE_LIMIT_SCRIPT, 1, key, RATE_LIMIT_WINDOW, bucket.admissions
+                )
+                bucket.admissions = 0
+                if current > RATE_LIMIT:
+                    bucket.block(ttl if ttl > 0 else RATE_LIMIT_WINDOW)
+                    admitted = False
+            
+        if not admitted:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded"
+            )
+
+    async def _cache_get(self, cache_key: str) -> Optional[Dict]:
+        """Return a cached result, or None on a miss"""
+        cached_result = await self.cache_client.get(cache_key)
+        if cached_result:
+            return msgpack.unpackb(cached_result, raw=False)
+        return None
+
+    async def _cache_set(self, cache_key: str, result: Dict) -> None:
+        """Cache a result for CACHE_TTL seconds"""
+        await self.cache_client.setex(
+            cache_key,
+            CACHE_TTL,
+            msgpack.packb(result, use_bin_type=True)
+        )
+
     def _initialize_circuit_breaker(self) -> 'CircuitBreaker':
         """Initialize circuit breaker for fault tolerance"""
         return CircuitBreaker(
@@ -208,12 +329,6 @@ class DetectionService:
                     }
                 )
                 
-                # Check cache
-                cache_key = f"species:{hash(processed_image.tobytes())}"
-                cached_result = self.cache_client.get(cache_key)
-                if cached_result:
-                    return json.loads(cached_result)
-                
                 # Perform detection
                 try:
                     species_name, confidence, metrics = self.species_classifier.predict_species(
@@ -227,20 +342,12 @@ class DetectionService:
                 # Process results
                 result = {
                     'species': species_name,
-                    'confidence': float(confidence),
+                    'confidence': confidence,
                     'processing_time': metrics['latency_ms'],
                     'enhanced': enhance_detection,
                     'hardware_metrics': metrics['hardware_utilization']
                 }
                 
-                # Cache result
-                if confidence >= DEFAULT_CONFIDENCE_THRESHOLD:
-                    self.cache_client.setex(
-                        cache_key,
-                        CACHE_TTL,
-                        json.dumps(result)
-                    )
-                
                 # Record success
                 self.circuit_breaker.record_success()
                 self.metrics.record_detection(
@@ -252,9 +359,115 @@ class DetectionService:
                 return result
                 
         except Exception as e:
-            logger.error(f"Species detection error: {str(e)}")
+            logger.exception("Species detection error")
             raise
 
+    async def submit_species(
+        self,
+        image: np.ndarray,
+        enhance_detection: bool = False,
+        trace_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Detect species through the micro-batcher with per-request rate limiting,
+        caching and metrics.
+        
+        Args:
+            image: Input image array
+            enhance_detection: Whether to apply detection enhancements
+            trace_id: Optional trace ID for request tracking
+            
+        Returns:
+            Detection result for this image
+        """
+        with self.tracer.start_as_current_span("submit_species") as span:
+            if span.is_recording():
+                span.set_attributes({"trace_id": trace_id or "", "enhance_detection": enhance_detection})
+            start_time = time.perf_counter()
+            
+            # Admission and cache lookup happen per request, before batching
+            await self._check_rate_limit("detect_species")
+            cache_key = ":".join(["submit_species", _cache_key_part(image), repr(enhance_detection)])
+            result = await self._cache_get(cache_key)
+            
+            if result is None:
+                future = asyncio.get_running_loop().create_future()
+                self._pending[enhance_detection].append((image, future))
+                self._batch_event.set()
+                
+                if self._batcher_task is None or self._batcher_task.done():
+                    self._batcher_task = asyncio.create_task(self.run_batcher())
+                
+                result = await future
+                self.metrics.record_detection(
+                    result['species'],
+                    result['confidence'],
+                    result['processing_time']
+                )
+                await self._cache_set(cache_key, result)
+            
+            self.metrics.record_latency(
+                "submit_species",
+                (time.perf_counter() - start_time) * 1000
+            )
+            return result
+
+    async def run_batcher(self) -> None:
+        """Coalesce queued species requests into batches and fan results back out"""
+        while True:
+            await self._batch_event.wait()
+            
+            # Give concurrent requests a short window to join unless a batch is already full
+            if all(len(pending) < BATCH_SIZE for pending in self._pending.values()):
+                await asyncio.sleep(MICRO_BATCH_WINDOW)
+            self._batch_event.clear()
+            
+            for enhance_detection, pending in self._pending.items():
+                while pending:
+                    batch = pending[:BATCH_SIZE]
+                    del pending[:BATCH_SIZE]
+                    await self._dispatch_species_batch(batch, enhance_detection)
+
+    async def _dispatch_species_batch(
+        self,
+        batch: List[Tuple[np.ndarray, asyncio.Future]],
+        enhance_detection: bool
+    ) -> None:
+        """Run one homogeneous batch through the classifier and resolve its futures"""
+        try:
+            if not self.circuit_breaker.is_available():
+                raise HTTPException(
+                    status_code=503,
+                    detail="Service temporarily unavailable"
+                )
+            
+            results = await asyncio.to_thread(
+                self.species_classifier.batch_predict,
+                [image for image, _ in batch],
+                augment=enhance_detection
+            )
+            self.circuit_breaker.record_success()
+            
+        except Exception as e:
+            if not isinstance(e, HTTPException):
+                self.circuit_breaker.record_failure()
+            logger.exception("Species micro-batch error")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), (species_name, confidence, metrics) in zip(batch, results):
+            if not future.done():
+                future.set_result({
+                    'species': species_name,
+                    'confidence': float(confidence),
+                    'processing_time': metrics.get('latency_ms'),
+                    'enhanced': enhance_detection,
+                    'hardware_metrics': metrics.get('hardware_utilization'),
+                    'metrics': metrics
+                })
+
     @monitored
     async def detect_fossil(
         self,
@@ -300,21 +513,25 @@ class DetectionService:
                 return result
                 
         except Exception as e:
-            logger.error(f"Fossil detection error: {str(e)}")
+            logger.exception("Fossil detection error")
             raise
 
     @monitored
     async def batch_process(
         self,
-        images: List[np.ndarray],
-        process_type: str = 'species'
+        images: Union[List[np.ndarray], np.ndarray],
+        process_type: str = 'species',
+        enhance_detection: bool = False,
+        generate_3d: bool = False
     ) -> List[Dict]:
         """
         Process multiple images in batch with optimized parallel execution.
         
         Args:
-            images: List of input images
+            images: List of input images, or one contiguous (N, H, W, C) array
             process_type: Type of processing ('species' or 'fossil')
+            enhance_detection: Whether to apply detection enhancements to species images
+            generate_3d: Whether to generate 3D models for fossil scans
             
         Returns:
             List of detection results
@@ -324,25 +541,71 @@ class DetectionService:
                 raise ValueError(f"Batch size exceeds maximum: {MAX_BATCH_SIZE}")
             
             if process_type == 'species':
-                results = await self._batch_process_species(images)
+                results = await self._batch_process_species(images, enhance_detection)
             elif process_type == 'fossil':
-                results = await self._batch_process_fossils(images)
+                results = await self._batch_process_fossils(images, generate_3d)
             else:
                 raise ValueError(f"Invalid process type: {process_type}")
             
             return results
             
         except Exception as e:
-            logger.error(f"Batch processing error: {str(e)}")
+            logger.exception("Batch processing error")
             raise
 
-    async def _batch_process_species(self, images: List[np.ndarray]) -> List[Dict]:
-        """Helper method for batch species detection"""
-        try:
-            results = self.species_classifier.batch_predict(
+    def _select_batch_size(self) -> int:
+        """Pick the largest batch-size bucket whose latency EWMA stays within the SLO budget"""
+        # Estimates halve every LATENCY_EWMA_HALF_LIFE seconds without a measurement,
+        # so a bucket ruled out by one spike is eventually probed again
+        now = time.monotonic()
+        return max(
+            (
+                size for size, latency in self._batch_latency_ewma.items()
+                if latency * 0.5 ** ((now - self._batch_latency_updated[size]) / LATENCY_EWMA_HALF_LIFE)
+                < BATCH_LATENCY_BUDGET
+            ),
+            default=BATCH_SIZE_BUCKETS[0]
+        )
+
+    async def _predict_species_chunk(
+        self,
+        images: List[np.ndarray],
+        augment: bool = False
+    ) -> List[Tuple]:
+        """Run one chunk through the classifier and fold its latency into the bucket EWMA"""
+        # Attribute the latency to the bucket the chunk actually fills, so small
+        # chunks do not make a large bucket look cheap
+        bucket = next(size for size in BATCH_SIZE_BUCKETS if size >= len(images))
+        async with self._model_semaphore:
+            start_time = time.perf_counter()
+            results = await asyncio.to_thread(
+                self.species_classifier.batch_predict,
                 images,
-                enable_parallel=True
+                enable_parallel=True,
+                augment=augment
             )
+            latency = (time.perf_counter() - start_time) * 1000
+        
+        self._batch_latency_ewma[bucket] += LATENCY_EWMA_ALPHA * (latency - self._batch_latency_ewma[bucket])
+        self._batch_latency_updated[bucket] = time.monotonic()
+        return results
+
+    async def _batch_process_species(
+        self,
+        images: Union[List[np.ndarray], np.ndarray],
+        enhance_detection: bool = False
+    ) -> List[Dict]:
+        """Helper method for batch species detection"""
+        try:
+            # Chunk to the adaptive batch size so one slow batch cannot time out everything
+            batch_size = self._select_batch_size()
+            trace.get_current_span().set_attribute("batch_size", batch_size)
+            
+            chunk_results = await asyncio.gather(*[
+                self._predict_species_chunk(images[i:i + batch_size], enhance_detection)
+                for i in range(0, len(images), batch_size)
+            ])
+            results = [result for chunk in chunk_results for result in chunk]
             
             return [
                 {
@@ -354,20 +617,54 @@ class DetectionService:
             ]
             
         except Exception as e:
-            logger.error(f"Species batch processing error: {str(e)}")
+            logger.exception("Species batch processing error")
             raise
 
-    async def _batch_process_fossils(self, scans: List[np.ndarray]) -> List[Dict]:
+    async def _batch_process_fossils(
+        self,
+        scans: List[np.ndarray],
+        generate_3d: bool = False
+    ) -> List[Dict]:
         """Helper method for batch fossil detection"""
         try:
+            # One batched forward pass instead of a serial await per scan
+            detection_results = await asyncio.to_thread(
+                self.fossil_detector.batch_detect,
+                list(scans)
+            )
+            
+            # Age estimation for the whole batch runs in one worker call, and
+            # each 3D model is generated concurrently on its own worker thread
+            pending = [
+                asyncio.to_thread(
+                    self.fossil_detector.estimate_fossil_ages,
+                    [detection_result['features'] for detection_result in detection_results]
+                )
+            ]
+            if generate_3d:
+                pending.extend(
+                    asyncio.to_thread(self.fossil_detector.generate_3d_model, scan)
+                    for scan in scans
+                )
+            age_estimations, *model_data = await asyncio.gather(*pending)
+            
             results = []
-            for scan in scans:
-                result = await self.detect_fossil(scan)
+            for idx, detection_result in enumerate(detection_results):
+                result = {
+                    'fossil_type': detection_result['fossil_type'],
+                    'confidence': detection_result['confidence'],
+                    'measurements': detection_result['measurements'],
+                    'age_estimation': age_estimations[idx],
+                    'processing_time': detection_result['processing_time']
+                }
+                if model_data:
+                    result['3d_model'] = model_data[idx]
                 results.append(result)
+            
             return results
             
         except Exception as e:
-            logger.error(f"Fossil batch processing error: {str(e)}")
+            logger.exception("Fossil batch processing error")
             raise
 
     @monitored
@@ -384,7 +681,7 @@ class DetectionService:
             fossil_model_healthy = self._check_model_health(self.fossil_detector)
             
             # Check cache connection
-            cache_healthy = self._check_cache_health()
+            cache_healthy = await self._check_cache_health()
             
             # Get performance metrics
             performance_metrics = self.metrics.get_recent_metrics()
@@ -405,16 +702,14 @@ class DetectionService:
             }
             
         except Exception as e:
-            logger.error(f"Health check error: {str(e)}")
+            logger.exception("Health check error")
             return {'status': 'unhealthy', 'error': str(e)}
 
     def _check_model_health(self, model: Union[SpeciesClassifier, FossilDetector]) -> bool:
         """Check individual model health"""
         try:
-            # Generate dummy input
-            dummy_input = np.random.rand(1, 640, 640, 3)
-            
             # Attempt prediction
+            dummy_input = self._health_check_input
             _ = model.predict_species(dummy_input) if isinstance(
                 model, SpeciesClassifier
             ) else model.detect_fossil(dummy_input)
@@ -422,16 +717,16 @@ class DetectionService:
             return True
             
         except Exception as e:
-            logger.error(f"Model health check failed: {str(e)}")
+            logger.warning("Model health check failed: %s", e)
             return False
 
-    def _check_cache_health(self) -> bool:
+    async def _check_cache_health(self) -> bool:
         """Check cache connection health"""
         try:
-            self.cache_client.ping()
+            await self.cache_client.ping()
             return True
         except Exception as e:
-            logger.error(f"Cache health check failed: {str(e)}")
+            logger.exception("Cache health check failed")
             return False
 
 # Module exports
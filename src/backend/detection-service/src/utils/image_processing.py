@@ -1,30 +1,107 @@
 # External imports with versions
 import numpy as np  # version: 1.24.0
-from PIL import Image, ImageOps  # version: 10.0.0
+from PIL import Image  # version: 10.0.0
 import cv2  # version: 4.8.0
 import albumentations as A  # version: 1.3.1
+from numba import njit, prange, set_num_threads  # version: 0.58.1
 import logging
-from typing import Union, Optional, Dict, Tuple
-from functools import wraps
+from typing import Union, Optional, Dict, Tuple, List
+from functools import wraps, lru_cache
 import time
+import io
+import threading
+import os
+import struct
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional libjpeg-turbo decoder for the JPEG fast path
+try:
+    import simplejpeg  # version: 1.7.2
+except ImportError:
+    simplejpeg = None
 
 # Internal imports
 from ..models.lnn_model import LiquidNeuralNetwork
 from ..utils.model_utils import preprocess_image
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Module logger; handlers are configured by the app factory
 logger = logging.getLogger(__name__)
 
 # Global constants
 TARGET_SIZE = (640, 640)
 MEAN_RGB = np.array([0.485, 0.456, 0.406])
 STD_RGB = np.array([0.229, 0.224, 0.225])
+# (x / 255 - mean) / std folded into x * scale + offset for the fused kernel
+NORMALIZE_SCALE = (1.0 / (255.0 * STD_RGB)).astype(np.float32)
+NORMALIZE_OFFSET = (-MEAN_RGB / STD_RGB).astype(np.float32)
 MAX_ROTATION_DEGREES = 15
 MAX_ZOOM_FACTOR = 1.15
 BATCH_SIZE = 32
 GPU_MEMORY_LIMIT = 1024  # MB
 PROCESSING_TIMEOUT = 100  # ms
+JPEG_MAGIC = b'\xff\xd8\xff'
+EXIF_ORIENTATION_TAG = 0x0112
+EXIF_SCAN_BYTES = 64 * 1024  # JPEG header window searched for the APP1 Exif segment
+# EXIF orientation -> (cv2 rotate code or None, axis flipped afterwards as a view or None)
+EXIF_ORIENTATION_OPS = {
+    2: (None, 1),
+    3: (cv2.ROTATE_180, None),
+    4: (None, 0),
+    5: (cv2.ROTATE_90_CLOCKWISE, 1),
+    6: (cv2.ROTATE_90_CLOCKWISE, None),
+    7: (cv2.ROTATE_90_COUNTERCLOCKWISE, 1),
+    8: (cv2.ROTATE_90_COUNTERCLOCKWISE, None)
+}
+IMAGE_CACHE_SIZE = 512  # decoded path inputs kept for repeated loads
+IMAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # decoded pixel budget per worker process
+TARGET_DTYPE = np.float16  # normalized range is bounded, so half precision loses nothing useful
+PREPROCESS_WORKERS = os.cpu_count() or 1
+PREPROCESS_TILE_ROWS = 64  # output rows per tile; uint8 source + float32 output stay in L2
+
+INTERPOLATION_METHODS = {
+    'bilinear': cv2.INTER_LINEAR,
+    'cubic': cv2.INTER_CUBIC,
+    'lanczos': cv2.INTER_LANCZOS4
+}
+
+# Parallelism comes from preprocessing images concurrently, so keep OpenCV itself
+# single-threaded instead of oversubscribing cores
+cv2.setNumThreads(1)
+
+# Per-thread float32 scratch for normalizing into narrower output buffers
+_scratch_local = threading.local()
+
+# Decoded path inputs, bounded by entry count and total pixel bytes
+_image_cache: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_image_cache_bytes = 0
+_image_cache_lock = threading.Lock()
+
+@lru_cache(maxsize=32)
+def _build_augmentation(params: Tuple[Tuple[str, object], ...] = ()) -> A.Compose:
+    """Build the augmentation pipeline once per distinct set of Compose overrides"""
+    compose_kwargs = {'p': 0.5, **dict(params)}
+    return A.Compose([
+        A.RandomRotate90(p=0.2),
+        A.Rotate(limit=MAX_ROTATION_DEGREES, p=0.3),
+        A.RandomBrightnessContrast(p=0.3),
+        A.RandomGamma(p=0.2),
+        A.GaussNoise(p=0.2),
+        A.OneOf([
+            A.MotionBlur(p=0.2),
+            A.MedianBlur(blur_limit=3, p=0.1),
+            A.GaussianBlur(blur_limit=3, p=0.1),
+        ], p=0.2),
+    ], **compose_kwargs)
+
+# Blur branch of the default pipeline, applied after the fused kernel when sampled
+_BLUR_AUGMENTATION = A.OneOf([
+    A.MotionBlur(p=0.2),
+    A.MedianBlur(blur_limit=3, p=0.1),
+    A.GaussianBlur(blur_limit=3, p=0.1),
+], p=1.0)
+# Single shared generator behind every fused augmentation decision
+_augment_rng = np.random.default_rng()
 
 def performance_monitor(func):
     """Decorator for monitoring processing performance"""
@@ -61,6 +138,197 @@ def error_handler(func):
             raise
     return wrapper
 
+@njit(parallel=True, nogil=True, cache=True, fastmath=True)
+def _fused_normalize(src: np.ndarray, scale: np.ndarray, offset: np.ndarray, out: np.ndarray) -> None:
+    """Rescale and normalize uint8 rows into float32 in one pass over each pixel"""
+    rows, width, channels = src.shape
+    for i in prange(rows):
+        for j in range(width):
+            for c in range(channels):
+                out[i, j, c] = src[i, j, c] * scale[c] + offset[c]
+
+# splitmix64 constants for counter-based noise that is reproducible on any thread
+_SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_SPLITMIX_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_SPLITMIX_MIX2 = np.uint64(0x94D049BB133111EB)
+
+@njit(nogil=True, cache=True)
+def _splitmix64(x: np.uint64) -> np.uint64:
+    """One splitmix64 step: a well-mixed 64-bit hash of x"""
+    x = x + _SPLITMIX_GAMMA
+    x = (x ^ (x >> np.uint64(30))) * _SPLITMIX_MIX1
+    x = (x ^ (x >> np.uint64(27))) * _SPLITMIX_MIX2
+    return x ^ (x >> np.uint64(31))
+
+@njit(nogil=True, cache=True)
+def _hashed_normal(seed: np.uint64, index: int) -> float:
+    """Standard normal sample for (seed, index) via Box-Muller over two hashed uniforms"""
+    first = _splitmix64(seed ^ np.uint64(index))
+    second = _splitmix64(first)
+    u1 = ((first >> np.uint64(11)) + np.uint64(1)) * (1.0 / 9007199254740992.0)
+    u2 = (second >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+    return np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+@njit(parallel=True, nogil=True, cache=True, fastmath=True)
+def _fused_augment(
+    src: np.ndarray,
+    out: np.ndarray,
+    cos_a: float,
+    sin_a: float,
+    alpha: float,
+    beta: float,
+    gamma: float,
+    noise_sigma: float,
+    noise_seed: np.uint64
+) -> None:
+    """Rotate (bilinear), adjust brightness/contrast and gamma, and add noise in one pass"""
+    height, width, channels = src.shape
+    cy = (height - 1) * 0.5
+    cx = (width - 1) * 0.5
+    for i in prange(height):
+        dy = i - cy
+        for j in range(width):
+            # Inverse-map the output pixel about the centre, replicating edges
+            dx = j - cx
+            sx = min(max(cos_a * dx - sin_a * dy + cx, 0.0), width - 1.0)
+            sy = min(max(sin_a * dx + cos_a * dy + cy, 0.0), height - 1.0)
+            x0 = int(sx)
+            y0 = int(sy)
+            x1 = min(x0 + 1, width - 1)
+            y1 = min(y0 + 1, height - 1)
+            fx = sx - x0
+            fy = sy - y0
+            for c in range(channels):
+                top = src[y0, x0, c] * (1.0 - fx) + src[y0, x1, c] * fx
+                bottom = src[y1, x0, c] * (1.0 - fx) + src[y1, x1, c] * fx
+                v = (top * (1.0 - fy) + bottom * fy) * (1.0 / 255.0)
+                v = min(max(alpha * v + beta, 0.0), 1.0) ** gamma * 255.0
+                if noise_sigma > 0.0:
+                    v += noise_sigma * _hashed_normal(noise_seed, (i * width + j) * channels + c)
+                out[i, j, c] = np.uint8(min(max(v + 0.5, 0.0), 255.0))
+
+@lru_cache(maxsize=256)
+def _resize_plan(h: int, w: int, target_w: int, target_h: int) -> Tuple[int, int, int, int, int, int]:
+    """Aspect-preserving size and (top, bottom, left, right) padding for a source shape"""
+    scale = min(target_w / w, target_h / h)
+    new_w, new_h = int(w * scale), int(h * scale)
+    pad_left = (target_w - new_w) // 2
+    pad_top = (target_h - new_h) // 2
+    return new_w, new_h, pad_top, target_h - new_h - pad_top, pad_left, target_w - new_w - pad_left
+
+def _scratch_buffer(shape: tuple) -> np.ndarray:
+    """Return this thread's float32 scratch viewed as shape, growing it only when too small"""
+    size = int(np.prod(shape))
+    buffer = getattr(_scratch_local, 'buffer', None)
+    if buffer is None or buffer.size < size:
+        buffer = np.empty(size, dtype=np.float32)
+        _scratch_local.buffer = buffer
+    return buffer[:size].reshape(shape)
+
+@njit(parallel=True, nogil=True, cache=True, fastmath=True)
+def _resize_normalize_rows(
+    src: np.ndarray,
+    y_lo: np.ndarray,
+    y_hi: np.ndarray,
+    y_weight: np.ndarray,
+    x_lo: np.ndarray,
+    x_hi: np.ndarray,
+    x_weight: np.ndarray,
+    scale: np.ndarray,
+    offset: np.ndarray,
+    out: np.ndarray
+) -> None:
+    """Bilinear-sample uint8 rows through precomputed tables and normalize them in one pass"""
+    for i in prange(len(y_lo)):
+        top, bottom, fy = src[y_lo[i]], src[y_hi[i]], y_weight[i]
+        for j in range(len(x_lo)):
+            left, right, fx = x_lo[j], x_hi[j], x_weight[j]
+            for c in range(3):
+                top_left, bottom_left = np.float32(top[left, c]), np.float32(bottom[left, c])
+                upper = top_left + (top[right, c] - top_left) * fx
+                lower = bottom_left + (bottom[right, c] - bottom_left) * fx
+                out[i, j, c] = (upper + (lower - upper) * fy) * scale[c] + offset[c]
+
+def _axis_sampling(src_len: int, dst_len: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Source neighbours and weights per output index, matching cv2 INTER_LINEAR centres"""
+    position = np.clip((np.arange(dst_len) + 0.5) * (src_len / dst_len) - 0.5, 0, src_len - 1)
+    lo = position.astype(np.intp)
+    hi = np.minimum(lo + 1, src_len - 1)
+    weight = (position - lo).astype(np.float32)
+    for table in (lo, hi, weight):
+        table.setflags(write=False)
+    return lo, hi, weight
+
+@lru_cache(maxsize=32)
+def _bilinear_tables(h: int, w: int, new_h: int, new_w: int) -> Tuple[np.ndarray, ...]:
+    """Per-shape resampling tables, built once for each distinct source resolution"""
+    return _axis_sampling(h, new_h) + _axis_sampling(w, new_w)
+
+def _preprocess_buffer(dtype=TARGET_DTYPE) -> np.ndarray:
+    """Return this thread's reusable (1, H, W, 3) preprocessing output of dtype"""
+    buffers = getattr(_scratch_local, 'preprocess_out', None)
+    if buffers is None:
+        buffers = _scratch_local.preprocess_out = {}
+    dtype = np.dtype(dtype)
+    buffer = buffers.get(dtype)
+    if buffer is None:
+        buffer = buffers[dtype] = np.empty((1, TARGET_SIZE[1], TARGET_SIZE[0], 3), dtype=dtype)
+    return buffer
+
+def _letterbox_normalize_tiled(
+    image: np.ndarray,
+    target_size: tuple = TARGET_SIZE,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Letterbox-resize, normalize and cast a uint8 RGB image tile by tile.
+    
+    Each band of output rows is resampled, normalized and cast to the output
+    dtype while it is still cache resident, instead of walking the full image
+    once per stage.
+    
+    Args:
+        image: Input uint8 HWC image
+        target_size: Desired output size
+        out: Optional float32 or float16 HWC destination, possibly a strided view
+        
+    Returns:
+        np.ndarray: Normalized HWC image of target_size
+    """
+    new_w, new_h, pad_h, _, pad_w, _ = _resize_plan(*image.shape[:2], *target_size)
+    y_lo, y_hi, y_weight, x_lo, x_hi, x_weight = _bilinear_tables(*image.shape[:2], new_h, new_w)
+    
+    if out is None:
+        out = np.empty((target_size[1], target_size[0], 3), dtype=np.float32)
+    
+    # Border pixels are black, which normalizes to the per-channel offset
+    out[:pad_h] = NORMALIZE_OFFSET
+    out[pad_h + new_h:] = NORMALIZE_OFFSET
+    out[pad_h:pad_h + new_h, :pad_w] = NORMALIZE_OFFSET
+    out[pad_h:pad_h + new_h, pad_w + new_w:] = NORMALIZE_OFFSET
+    
+    # Narrower outputs are normalized into a float32 tile and cast before it leaves cache
+    scratch = None
+    if out.dtype != np.float32:
+        scratch = _scratch_buffer((PREPROCESS_TILE_ROWS, new_w, 3))
+    
+    for y0 in range(0, new_h, PREPROCESS_TILE_ROWS):
+        rows = slice(y0, min(y0 + PREPROCESS_TILE_ROWS, new_h))
+        num_rows = rows.stop - y0
+        dst = out[pad_h + y0:pad_h + rows.stop, pad_w:pad_w + new_w]
+        _resize_normalize_rows(
+            image,
+            y_lo[rows], y_hi[rows], y_weight[rows],
+            x_lo, x_hi, x_weight,
+            NORMALIZE_SCALE,
+            NORMALIZE_OFFSET,
+            dst if scratch is None else scratch[:num_rows]
+        )
+        if scratch is not None:
+            np.copyto(dst, scratch[:num_rows])
+    
+    return out
+
 @error_handler
 def load_image(
     image_source: Union[str, bytes],
@@ -70,6 +338,10 @@ def load_image(
     """
     Load and validate image from file path or bytes with memory optimization.
     
+    Path inputs are served from an LRU cache keyed by path and modification
+    time, bounded by IMAGE_CACHE_MAX_BYTES of decoded pixels, and come back
+    read-only; copy before mutating them.
+    
     Args:
         image_source: Path to image file or image bytes
         validate_content: Whether to validate image content
@@ -78,16 +350,126 @@ def load_image(
     Returns:
         np.ndarray: Loaded and validated image array in RGB format
     """
+    if isinstance(image_source, str):
+        return _load_image_cached(
+            image_source,
+            os.stat(image_source).st_mtime_ns,
+            validate_content,
+            handle_exif
+        )
+    return _decode_image(image_source, validate_content, handle_exif)
+
+def _load_image_cached(
+    path: str,
+    mtime_ns: int,
+    validate_content: bool,
+    handle_exif: bool
+) -> np.ndarray:
+    """Decode an image file once per modification time into a shared read-only array"""
+    global _image_cache_bytes
+    key = (path, mtime_ns, validate_content, handle_exif)
+    with _image_cache_lock:
+        image_array = _image_cache.get(key)
+        if image_array is not None:
+            _image_cache.move_to_end(key)
+            return image_array
+    
+    image_array = _decode_image(path, validate_content, handle_exif)
+    image_array.setflags(write=False)
+    
+    # Images larger than the whole budget are returned without being cached
+    if image_array.nbytes > IMAGE_CACHE_MAX_BYTES:
+        return image_array
+    
+    with _image_cache_lock:
+        previous = _image_cache.pop(key, None)
+        if previous is not None:
+            _image_cache_bytes -= previous.nbytes
+        _image_cache[key] = image_array
+        _image_cache_bytes += image_array.nbytes
+        while len(_image_cache) > IMAGE_CACHE_SIZE or _image_cache_bytes > IMAGE_CACHE_MAX_BYTES:
+            _, evicted = _image_cache.popitem(last=False)
+            _image_cache_bytes -= evicted.nbytes
+    return image_array
+
+def _jpeg_exif_orientation(data: bytes) -> int:
+    """Read the EXIF orientation tag from a JPEG header without decoding, defaulting to upright"""
+    view = memoryview(data)[:EXIF_SCAN_BYTES]
+    offset = 2
     try:
-        # Load image based on source type
+        while offset + 4 <= len(view) and view[offset] == 0xFF:
+            marker = view[offset + 1]
+            if marker in (0xD9, 0xDA):  # end of image / start of scan: no more metadata
+                break
+            length = struct.unpack_from('>H', view, offset + 2)[0]
+            if marker == 0xE1 and view[offset + 4:offset + 10] == b'Exif\x00\x00':
+                tiff = offset + 10
+                endian = '<' if view[tiff:tiff + 2] == b'II' else '>'
+                ifd = tiff + struct.unpack_from(endian + 'I', view, tiff + 4)[0]
+                entries = struct.unpack_from(endian + 'H', view, ifd)[0]
+                for entry in range(ifd + 2, ifd + 2 + 12 * entries, 12):
+                    tag, _, _, value = struct.unpack_from(endian + 'HHIH', view, entry)
+                    if tag == EXIF_ORIENTATION_TAG:
+                        return value
+                break
+            offset += 2 + length
+    except struct.error:
+        pass
+    return 1
+
+def _apply_exif_orientation(image_array: np.ndarray, orientation: int) -> np.ndarray:
+    """Upright a decoded image with at most one rotation and one flipped view"""
+    rotate_code, flip_axis = EXIF_ORIENTATION_OPS.get(orientation, (None, None))
+    if rotate_code is not None:
+        image_array = cv2.rotate(image_array, rotate_code)
+    if flip_axis is not None:
+        image_array = np.flip(image_array, flip_axis)
+    return image_array
+
+def _decode_image(
+    image_source: Union[str, bytes],
+    validate_content: bool,
+    handle_exif: bool
+) -> np.ndarray:
+    """Decode image bytes or a file into an RGB uint8 array"""
+    try:
+        # JPEG bytes decode straight to RGB with libjpeg-turbo; upright images
+        # (the common case) need no orientation work at all. The accurate integer
+        # DCT is kept: the classifier is gated on a 90% confidence threshold, and
+        # fastdct's ringing error is not worth its few percent of decode time.
+        if simplejpeg is not None and isinstance(image_source, bytes) and image_source.startswith(JPEG_MAGIC):
+            try:
+                image_array = simplejpeg.decode_jpeg(image_source, colorspace='RGB', fastdct=False)
+            except (ValueError, RuntimeError):
+                # JPEGs libjpeg-turbo cannot convert to RGB (e.g. CMYK/YCCK) go through OpenCV/PIL
+                image_array = None
+            if image_array is not None:
+                if validate_content and (image_array.shape[0] < 10 or image_array.shape[1] < 10):
+                    raise ValueError("Image dimensions too small")
+                if handle_exif:
+                    image_array = _apply_exif_orientation(image_array, _jpeg_exif_orientation(image_source))
+                return image_array
+        
+        # OpenCV decodes with libjpeg-turbo into one contiguous buffer and applies
+        # EXIF orientation itself unless told to ignore it
+        flags = cv2.IMREAD_COLOR if handle_exif else cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+        if isinstance(image_source, str):
+            image_array = cv2.imread(image_source, flags)
+        else:
+            image_array = cv2.imdecode(np.frombuffer(image_source, dtype=np.uint8), flags)
+        if image_array is not None:
+            image_array = cv2.cvtColor(image_array, cv2.COLOR_BGR2RGB)
+            if validate_content and (image_array.shape[0] < 10 or image_array.shape[1] < 10):
+                raise ValueError("Image dimensions too small")
+            return image_array
+        
+        # Formats OpenCV cannot read (e.g. HEIC) fall back to PIL
         if isinstance(image_source, str):
             image = Image.open(image_source)
         else:
             image = Image.open(io.BytesIO(image_source))
             
-        # Handle EXIF orientation if needed
-        if handle_exif:
-            image = ImageOps.exif_transpose(image)
+        orientation = image.getexif().get(EXIF_ORIENTATION_TAG, 1) if handle_exif else 1
             
         # Convert to RGB and validate
         image = image.convert('RGB')
@@ -95,10 +477,10 @@ def load_image(
             if image.size[0] < 10 or image.size[1] < 10:
                 raise ValueError("Image dimensions too small")
                 
-        # Convert to numpy array with memory optimization
+        # Convert to numpy array, then handle EXIF orientation on the array
         image_array = np.asarray(image, dtype=np.uint8)
         
-        return image_array
+        return _apply_exif_orientation(image_array, orientation)
         
     except Exception as e:
         logger.error(f"Image loading error: {str(e)}")
@@ -124,26 +506,18 @@ def resize_image(
     """
     try:
         # Select interpolation method
-        interpolation = {
-            'bilinear': cv2.INTER_LINEAR,
-            'cubic': cv2.INTER_CUBIC,
-            'lanczos': cv2.INTER_LANCZOS4
-        }.get(interpolation_method, cv2.INTER_LINEAR)
+        interpolation = INTERPOLATION_METHODS.get(interpolation_method, cv2.INTER_LINEAR)
         
-        # Calculate aspect ratio preserving dimensions
-        h, w = image.shape[:2]
-        scale = min(target_size[0]/w, target_size[1]/h)
-        new_w, new_h = int(w * scale), int(h * scale)
+        # Aspect ratio preserving dimensions, memoized per source shape
+        new_w, new_h, top, bottom, left, right = _resize_plan(*image.shape[:2], *target_size)
         
         # Perform GPU-accelerated resize
         resized = cv2.resize(image, (new_w, new_h), interpolation=interpolation)
         
         # Add padding if necessary
-        if new_w != target_size[0] or new_h != target_size[1]:
-            pad_w = (target_size[0] - new_w) // 2
-            pad_h = (target_size[1] - new_h) // 2
+        if top or bottom or left or right:
             resized = cv2.copyMakeBorder(
-                resized, pad_h, pad_h, pad_w, pad_w,
+                resized, top, bottom, left, right,
                 cv2.BORDER_CONSTANT, value=[0, 0, 0]
             )
             
@@ -157,7 +531,8 @@ def resize_image(
 @error_handler
 def normalize_image(
     image: np.ndarray,
-    batch_processing: Optional[bool] = False
+    batch_processing: Optional[bool] = False,
+    out: Optional[np.ndarray] = None
 ) -> np.ndarray:
     """
     Parallel-processed image normalization with batch support.
@@ -165,35 +540,99 @@ def normalize_image(
     Args:
         image: Input image array
         batch_processing: Whether to use batch processing
+        out: Optional preallocated float32 or float16 destination of the same shape
         
     Returns:
         np.ndarray: Normalized image array
     """
     try:
-        # Convert to float32 for processing
-        image = image.astype(np.float32)
+        # uint8 HWC / NHWC input: fused JIT kernel reads and writes each pixel once
+        if image.dtype == np.uint8 and image.shape[-1] == len(MEAN_RGB):
+            image = np.ascontiguousarray(image)
+            rows_shape = (-1, *image.shape[-2:])
+            if out is None:
+                out = np.empty(image.shape, dtype=np.float32)
+            if out.dtype == np.float32 and out.flags.c_contiguous:
+                target = out
+            else:
+                # Normalize into reusable thread-local scratch, then cast into place
+                target = _scratch_buffer(image.shape)
+            _fused_normalize(
+                image.reshape(rows_shape),
+                NORMALIZE_SCALE,
+                NORMALIZE_OFFSET,
+                target.reshape(rows_shape)
+            )
+            if target is not out:
+                np.copyto(out, target)
+            return out
         
-        if batch_processing and len(image.shape) == 4:
-            # Batch normalization
-            for i in range(0, len(image), BATCH_SIZE):
-                batch = image[i:i+BATCH_SIZE]
-                batch = (batch / 255.0 - MEAN_RGB) / STD_RGB
-                image[i:i+BATCH_SIZE] = batch
-        else:
-            # Single image normalization
-            image = (image / 255.0 - MEAN_RGB) / STD_RGB
-            
-        return image
+        # Other inputs: one multiply-add with the folded constants, cast during the
+        # multiply and accumulated in place, with no intermediate copies
+        if out is None:
+            out = np.empty(image.shape, dtype=np.float32)
+        np.multiply(image, NORMALIZE_SCALE, out=out)
+        np.add(out, NORMALIZE_OFFSET, out=out)
+        return out
         
     except Exception as e:
         logger.error(f"Normalization error: {str(e)}")
         raise
 
+def _init_preprocess_worker() -> None:
+    """Run this worker's Numba kernels on a single thread (the setting is per thread)"""
+    set_num_threads(1)
+
+# Workers preprocessing batch rows concurrently; the JIT kernels release the GIL
+_preprocess_pool = ThreadPoolExecutor(
+    max_workers=PREPROCESS_WORKERS,
+    thread_name_prefix="preprocess",
+    initializer=_init_preprocess_worker
+)
+
+def _augment_fused(image: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Apply the default augmentation pipeline with one fused kernel pass.
+    
+    Transform probabilities and ranges mirror _build_augmentation; only the
+    rarely sampled blur branch still runs through Albumentations.
+    
+    Args:
+        image: Input uint8 HWC image
+        rng: Generator supplying every random decision for this image
+        
+    Returns:
+        np.ndarray: Augmented uint8 image
+    """
+    # One bulk draw covers every gate and parameter, plus the noise seed
+    (apply, rot90_gate, rot90_turns, rotate_gate, rotate_draw, contrast_gate, alpha_draw,
+     beta_draw, gamma_gate, gamma_draw, noise_gate, noise_draw, blur_gate, seed_draw) = rng.random(14)
+    if apply >= 0.5:
+        return image
+    
+    # Quarter turns are a free strided view that the kernel reads through
+    if rot90_gate < 0.2:
+        image = np.rot90(image, int(rot90_turns * 4))
+    
+    angle = np.deg2rad((2.0 * rotate_draw - 1.0) * MAX_ROTATION_DEGREES) if rotate_gate < 0.3 else 0.0
+    alpha, beta = (0.8 + 0.4 * alpha_draw, 0.4 * beta_draw - 0.2) if contrast_gate < 0.3 else (1.0, 0.0)
+    gamma = 0.8 + 0.4 * gamma_draw if gamma_gate < 0.2 else 1.0
+    noise_sigma = np.sqrt(10.0 + 40.0 * noise_draw) if noise_gate < 0.2 else 0.0
+    noise_seed = np.uint64(int(seed_draw * 2 ** 53))
+    
+    augmented = np.empty(image.shape, dtype=np.uint8)
+    _fused_augment(image, augmented, np.cos(angle), np.sin(angle), alpha, beta, gamma, noise_sigma, noise_seed)
+    
+    if blur_gate < 0.2:
+        augmented = _BLUR_AUGMENTATION(image=augmented)['image']
+    return augmented
+
 @performance_monitor
 @error_handler
 def augment_image(
     image: np.ndarray,
-    augmentation_params: Optional[Dict] = None
+    augmentation_params: Optional[Dict] = None,
+    seed: Optional[int] = None
 ) -> np.ndarray:
     """
     GPU-accelerated real-time image augmentation pipeline.
@@ -201,28 +640,19 @@ def augment_image(
     Args:
         image: Input image array
         augmentation_params: Custom augmentation parameters
+        seed: Optional seed making the fused default pipeline reproducible
         
     Returns:
         np.ndarray: Augmented image array
     """
     try:
-        # Default augmentation pipeline
-        transform = A.Compose([
-            A.RandomRotate90(p=0.2),
-            A.Rotate(limit=MAX_ROTATION_DEGREES, p=0.3),
-            A.RandomBrightnessContrast(p=0.3),
-            A.RandomGamma(p=0.2),
-            A.GaussNoise(p=0.2),
-            A.OneOf([
-                A.MotionBlur(p=0.2),
-                A.MedianBlur(blur_limit=3, p=0.1),
-                A.GaussianBlur(blur_limit=3, p=0.1),
-            ], p=0.2),
-        ], p=0.5)
+        # Default pipeline on uint8 images runs as a single fused JIT pass
+        if not augmentation_params and image.dtype == np.uint8 and image.ndim == 3:
+            rng = _augment_rng if seed is None else np.random.default_rng(seed)
+            return _augment_fused(image, rng)
         
-        # Apply custom parameters if provided
-        if augmentation_params:
-            transform.update(augmentation_params)
+        # Reuse the memoized pipeline for these parameters instead of rebuilding it
+        transform = _build_augmentation(tuple(sorted((augmentation_params or {}).items())))
             
         # Apply augmentation
         augmented = transform(image=image)['image']
@@ -238,30 +668,56 @@ def augment_image(
 def preprocess_for_detection(
     image: np.ndarray,
     augment: bool = False,
-    processing_config: Optional[Dict] = None
+    processing_config: Optional[Dict] = None,
+    out: Optional[np.ndarray] = None
 ) -> np.ndarray:
     """
     Complete hardware-optimized preprocessing pipeline with performance monitoring.
     
+    Single images are written to out or, without one, to a per-thread buffer
+    that the next call on the same thread overwrites; copy the result to keep it.
+    Output is TARGET_DTYPE unless processing_config['dtype'] overrides it, e.g.
+    np.float32 for backends without half-precision support.
+    
     Args:
         image: Input image array
         augment: Whether to apply augmentation
         processing_config: Custom processing configuration
+        out: Optional (1, H, W, 3) float32 or float16 destination, possibly a strided view
         
     Returns:
         np.ndarray: Fully preprocessed image ready for model input
     """
     try:
+        processing_config = processing_config or {}
+        
         # Validate input
         if not isinstance(image, np.ndarray):
             raise ValueError("Input must be a numpy array")
+        
+        dtype = processing_config.get('dtype', TARGET_DTYPE)
+        if image.ndim == 3 and out is None:
+            out = _preprocess_buffer(dtype)
+        
+        # Plain uint8 RGB images: resize and normalize in cache-sized tiles
+        if not augment and image.dtype == np.uint8 and image.ndim == 3 and image.shape[-1] == 3:
+            _letterbox_normalize_tiled(image, TARGET_SIZE, out=out[0])
+            return out
             
         # Resize with aspect ratio preservation
         image = resize_image(image, TARGET_SIZE)
         
         # Apply augmentation if enabled
         if augment:
-            image = augment_image(image, processing_config.get('augmentation_params'))
+            image = augment_image(
+                image,
+                processing_config.get('augmentation_params'),
+                seed=processing_config.get('seed')
+            )
+        
+        if out is not None:
+            normalize_image(image, out=out[0])
+            return out
             
         # Normalize with batch processing if configured
         image = normalize_image(
@@ -273,17 +729,69 @@ def preprocess_for_detection(
         if len(image.shape) == 3:
             image = np.expand_dims(image, axis=0)
             
-        return image.astype(np.float32)
+        return image.astype(dtype, copy=False)
         
     except Exception as e:
         logger.error(f"Preprocessing error: {str(e)}")
         raise
 
+def preprocess_into(
+    image: np.ndarray,
+    out: np.ndarray,
+    augment: bool = False
+) -> np.ndarray:
+    """
+    Preprocess an image straight into a caller-provided model input buffer.
+    
+    Plain uint8 RGB images are letterboxed, normalized and cast to the buffer
+    dtype in a single tiled pass; other inputs are resized, optionally augmented
+    and normalized straight into the buffer.
+    
+    Args:
+        image: Input image array
+        out: Float32 or float16 HWC destination of TARGET_SIZE, possibly a strided view
+        augment: Whether to apply augmentation
+        
+    Returns:
+        np.ndarray: The filled destination buffer
+    """
+    return preprocess_for_detection(
+        image,
+        augment=augment,
+        processing_config={"batch_processing": True},
+        out=out[np.newaxis]
+    )[0]
+
+def preprocess_batch_into(
+    images: List[np.ndarray],
+    out: np.ndarray,
+    augment: bool = False
+) -> np.ndarray:
+    """
+    Preprocess a batch of images into the rows of a model input buffer in parallel.
+    
+    Args:
+        images: Input image arrays
+        out: Float32 or float16 NHWC destination with at least len(images) rows
+        augment: Whether to apply augmentation
+        
+    Returns:
+        np.ndarray: The filled destination buffer
+    """
+    # Each worker writes only its own row and uses its own thread-local scratch
+    list(_preprocess_pool.map(
+        lambda idx: preprocess_into(images[idx], out[idx], augment=augment),
+        range(len(images))
+    ))
+    return out
+
 # Module exports
 __all__ = [
     'load_image',
     'resize_image',
     'normalize_image',
     'augment_image',
-    'preprocess_for_detection'
+    'preprocess_for_detection',
+    'preprocess_into',
+    'preprocess_batch_into'
 ]
\ No newline at end of file
@@ -1,6 +1,7 @@
 # External imports with versions
 import pytest  # version: 7.4.0
 import numpy as np  # version: 1.24.0
+import torch  # version: 2.1.0
 import time
 from unittest.mock import Mock, patch
 
@@ -24,6 +25,16 @@ TEST_CONFIG = {
 PERFORMANCE_THRESHOLD_MS = 100
 ACCURACY_THRESHOLD = 0.90
 MOCK_IMAGE_SIZE = (640, 640, 3)
+MOCK_BATCH_SIZE = 32
+
+@pytest.fixture(scope='session')
+def rand_image_batch():
+    """Random float32 image batch generated once and shared read-only across tests"""
+    batch = np.random.default_rng(42).standard_normal(
+        (MOCK_BATCH_SIZE, *MOCK_IMAGE_SIZE), dtype=np.float32
+    )
+    batch.flags.writeable = False
+    return batch
 
 @pytest.fixture(scope='module')
 def setup_module():
@@ -76,7 +87,6 @@ class TestLiquidNeuralNetwork:
         try:
             self.config = MLConfig(**TEST_CONFIG)
             self.model = LiquidNeuralNetwork(self.config)
-            self.test_input = np.random.randn(1, *MOCK_IMAGE_SIZE)
             
         except Exception as e:
             pytest.fail(f"Test setup failed: {str(e)}")
@@ -96,7 +106,6 @@ class TestLiquidNeuralNetwork:
             assert self.model.config.learning_rate == 0.001, "Incorrect learning rate"
             
             # Verify device configuration
-            import torch
             expected_device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
             assert self.model.device == expected_device, "Incorrect device configuration"
             
@@ -104,17 +113,19 @@ class TestLiquidNeuralNetwork:
             pytest.fail(f"Model initialization test failed: {str(e)}")
 
     @pytest.mark.performance
-    def test_prediction_performance(self):
+    def test_prediction_performance(self, rand_image_batch):
         """Benchmark prediction performance for sub-100ms requirement"""
         try:
+            test_input = rand_image_batch[:1]
+            
             # Warm up
-            _ = self.model.predict(self.test_input)
+            _ = self.model.predict(test_input)
             
             # Measure performance over multiple iterations
             latencies = []
             for _ in range(100):
                 start_time = time.perf_counter()
-                _ = self.model.predict(self.test_input)
+                _ = self.model.predict(test_input)
                 latencies.append((time.perf_counter() - start_time) * 1000)
             
             median_latency = np.median(latencies)
@@ -135,17 +146,16 @@ class TestLiquidNeuralNetwork:
         try:
             # Test state initialization
             self.model.reset_states()
-            assert len(self.model.state_buffer) == 0, "State buffer not cleared"
+            assert not self.model.membrane_potential.any(), "State buffer not cleared"
             
             # Test state update
-            test_input = torch.randn(1, *MOCK_IMAGE_SIZE)
+            test_input = torch.randn(1, *MOCK_IMAGE_SIZE, device=self.model.device)
             self.model.update_states(test_input)
             
             # Verify state properties
-            for state in self.model.state_buffer.values():
-                assert state.membrane_potential.shape[-1] == 1024, "Invalid membrane potential shape"
-                assert not torch.isnan(state.membrane_potential).any(), "NaN values in membrane potential"
-                assert state.time_step >= 0, "Invalid time step"
+            assert self.model.membrane_potential.shape[-1] == 1024, "Invalid membrane potential shape"
+            assert not torch.isnan(self.model.membrane_potential).any(), "NaN values in membrane potential"
+            assert self.model.time_step >= 0, "Invalid time step"
                 
         except Exception as e:
             pytest.fail(f"Neural dynamics test failed: {str(e)}")
@@ -164,15 +174,16 @@ class TestSpeciesClassifier:
                 'hardware_config': {'gpu_enabled': True}
             }
             self.classifier = SpeciesClassifier(**self.config)
-            self.test_data = np.random.randn(10, *MOCK_IMAGE_SIZE)
             
         except Exception as e:
             pytest.fail(f"Classifier setup failed: {str(e)}")
 
     @pytest.mark.identification
-    def test_species_identification_accuracy(self):
+    def test_species_identification_accuracy(self, rand_image_batch):
         """Validate species identification accuracy"""
         try:
+            test_data = rand_image_batch[:10]
+            
             # Prepare test dataset
             test_species = ['test_species_1', 'test_species_2']
             test_labels = np.random.randint(0, len(test_species), 100)
@@ -181,7 +192,7 @@ class TestSpeciesClassifier:
             correct_predictions = 0
             total_predictions = 0
             
-            for image, label in zip(self.test_data, test_labels):
+            for image, label in zip(test_data, test_labels):
                 species_name, confidence, _ = self.classifier.predict_species(image)
                 if confidence >= self.classifier.confidence_threshold:
                     total_predictions += 1
@@ -196,11 +207,11 @@ class TestSpeciesClassifier:
             pytest.fail(f"Accuracy test failed: {str(e)}")
 
     @pytest.mark.batch
-    def test_batch_processing_performance(self):
+    def test_batch_processing_performance(self, rand_image_batch):
         """Test batch processing efficiency"""
         try:
-            batch_size = 32
-            test_batch = np.random.randn(batch_size, *MOCK_IMAGE_SIZE)
+            batch_size = MOCK_BATCH_SIZE
+            test_batch = rand_image_batch
             
             # Measure batch processing time
             start_time = time.perf_counter()